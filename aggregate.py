@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+CUBE_DIMS = ["Region", "Country", "Company", "Status", "RoleNorm", "Owner"]
+TOP_N = 30
+OTHER = "Other"
+
+
+class AggregationCube:
+    """Integer codes of the chart dimensions, built once per dataset.
+
+    `counts(rows)` groups the selected rows by every dimension at once; charts then roll the
+    result up to the levels they need instead of grouping the row-level frame again.
+    """
+
+    def __init__(self, std, dims=CUBE_DIMS):
+        self.dims = list(dims)
+        self._codes = {}
+        self._values = {}
+        for d in self.dims:
+            s = std[d]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                codes, values = s.cat.codes.to_numpy(), s.cat.categories
+            else:
+                codes, values = pd.factorize(s, use_na_sentinel=False)
+            self._codes[d] = codes.astype(np.int32, copy=False)
+            self._values[d] = values
+
+    def counts(self, rows):
+        """One row per observed combination of the dimensions with its number of prospects."""
+        codes = pd.DataFrame({d: self._codes[d][rows] for d in self.dims}, copy=False)
+        sizes = codes.groupby(self.dims, sort=False).size()
+        cube = sizes.index.to_frame(index=False)
+        for d in self.dims:
+            cube[d] = pd.Categorical.from_codes(cube[d].to_numpy(), categories=self._values[d])
+        cube["Prospects"] = sizes.to_numpy()
+        return cube
+
+
+def rollup(cube, dims):
+    """Prospect counts per combination of `dims`, largest first."""
+    out = cube.groupby(dims, observed=True)["Prospects"].sum().reset_index()
+    return out.sort_values("Prospects", ascending=False, kind="stable", ignore_index=True)
+
+
+def top_n(counts, dim, n=TOP_N, other=OTHER):
+    """`counts` (a cube or a rollup of it) with every `dim` value outside the `n` largest relabelled
+    `other` and the counts summed again. Roll up before truncating: it only groups what it is given."""
+    codes, values = pd.factorize(counts[dim])
+    if len(values) <= n:
+        return counts
+    totals = np.bincount(codes, weights=counts["Prospects"].to_numpy(), minlength=len(values))
+    keep = np.zeros(len(values), dtype=bool)
+    keep[np.argsort(-totals, kind="stable")[:n]] = True
+    labels = pd.Index(values.astype(object)).append(pd.Index([other], dtype=object)).unique()
+    codes = np.where(keep[codes], codes, labels.get_loc(other))
+    counts = counts.assign(**{dim: pd.Categorical.from_codes(codes, categories=labels)})
+    return rollup(counts, [c for c in counts.columns if c != "Prospects"])
+
+
+def company_summary(cube):
+    """Prospects and distinct countries/regions per company."""
+    pairs = rollup(cube, ["Company", "Country", "Region"])
+    g = pairs.groupby("Company", observed=True)
+    out = pd.DataFrame({
+        "Prospects": g["Prospects"].sum(),
+        "Countries": g["Country"].nunique(),
+        "Regions": g["Region"].nunique(),
+    }).reset_index()
+    return out.sort_values("Prospects", ascending=False, kind="stable", ignore_index=True)
@@ -1,11 +1,26 @@
-import io
 import json
 import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
+from ingest import FrameCache, content_key, csv_header, excel_sheet_names, read_csv_columns, read_upload
+from normalize import COLUMN_GUESSES, STD_COLUMNS, build_std, guess_column
+from countries import ISO3, unresolved
+from filter_index import BLANK_LABELS, FilterIndex, sidebar_filters
+from search_index import SearchIndex
+from dedup import MATCH_THRESHOLD, find_duplicates
+from aggregate import CUBE_DIMS, AggregationCube, company_summary, rollup, top_n
+from paging import PAGE_SIZES, SortKeys, link_columns, page_bounds
+from contacts import CARD_PAGE_SIZES, cards_html, top_k
+from scoring import ScoringEngine, score_frame
+from timing import StageTimer
+from export import EXCEL_MAX_ROWS, FORMATS, TEMPLATES, contact_list, export_bytes
+from store import LOAD_MAX_ROWS, ProspectStore
+
 st.set_page_config(page_title="Prospect Explorer", page_icon="🚗", layout="wide")
+# One timer per rerun; each lap closes the stage that ran since the previous one.
+timer = StageTimer()
 
 st.markdown(
     """
@@ -24,12 +39,14 @@ st.markdown(
 st.markdown('<div class="big-title">Prospect Explorer – EV & Sustainability</div>', unsafe_allow_html=True)
 
 st.sidebar.title("Data")
-st.sidebar.caption("Upload your Excel/CSV or use sample data.")
-use_sample = st.sidebar.toggle("Use sample data", value=False)
-uploaded = None if use_sample else st.sidebar.file_uploader("Excel (.xlsx) or CSV", type=["xlsx", "csv"]) 
+st.sidebar.caption("Upload your Excel/CSV, use sample data, or explore the local store.")
+store_mode = st.sidebar.toggle("Explore local store", value=False,
+                               help="Query the prospects merged into the on-disk store instead of an upload. Filters, search and chart counts run in SQLite.")
+use_sample = False if store_mode else st.sidebar.toggle("Use sample data", value=False)
+uploaded = None if use_sample or store_mode else st.sidebar.file_uploader("Excel (.xlsx) or CSV", type=["xlsx", "csv"]) 
 
 
-def load_df(file):
+def load_df(file, sheet=None, key=None):
     if file is None:
         data = {
             "Name": [
@@ -66,338 +83,557 @@ def load_df(file):
                        "Gmail domain","LATAM entry","Gov relationships","Hardware heavy","ME partnerships","Korea rollout"],
         }
         return pd.DataFrame(data)
-    else:
-        if file.name.lower().endswith(".csv"):
-            df = pd.read_csv(file)
-        else:
-            xls = pd.ExcelFile(file)
-            sheet = st.sidebar.selectbox("Sheet", xls.sheet_names, index=0)
-            df = pd.read_excel(xls, sheet_name=sheet)
-        for c in df.columns:
-            if pd.api.types.is_object_dtype(df[c]):
-                df[c] = df[c].astype(str).str.strip()
+    data = file.getvalue()
+    return frame_cache().get_or_load(key or content_key(data, sheet), lambda: read_upload(file.name, data, sheet, upload_key(file)))
+
+
+def load_csv_columns(file, columns, key):
+    def parse():
+        bar = st.sidebar.progress(0.0, text="Reading CSV…")
+        df = read_csv_columns(file.getvalue(), columns, progress=bar.progress)
+        bar.empty()
         return df
+    return frame_cache().get_or_load(key, parse)
+
+
+def upload_key(file):
+    keys = st.session_state.setdefault("_upload_keys", {})
+    if file.file_id not in keys:
+        keys[file.file_id] = content_key(file.getvalue())
+    return keys[file.file_id]
+
+
+@st.cache_resource
+def frame_cache():
+    return FrameCache()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def sheet_names(key, _data):
+    return excel_sheet_names(_data)
+
 
+@st.cache_resource
+def prospect_store():
+    return ProspectStore()
 
-try:
-    df_raw = load_df(uploaded)
-except Exception as e:
-    st.error(f"Couldn't read the file. Make sure it's a valid CSV/XLSX. Error: {e}")
-    st.stop()
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def store_options(version, column):
+    return prospect_store().distinct(column)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def stored_count(version, filters, query, role):
+    return prospect_store().count(filters, query, role)
+
+
+@st.cache_resource(max_entries=2, show_spinner="Querying the local store…")
+def stored_view(key, _filters, query, role):
+    return prospect_store().load(_filters, query, role)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def stored_kpis(key, cadence, today, _filters, query, role):
+    # Overdue depends on the date, so it is part of the key.
+    return prospect_store().kpis(_filters, query, role, dict(cadence), today)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def stored_counts(key, _filters, query, role):
+    return prospect_store().counts(CUBE_DIMS, _filters, query, role)
 
-st.sidebar.subheader("Columns")
 
 def selectbox_guess(label, options, guesses):
     opts = [None] + list(options)
-    lower = [str(o).lower() for o in options]
-    guess = None
-    for g in guesses:
-        if g.lower() in lower:
-            guess = options[lower.index(g.lower())]
-            break
+    guess = guess_column(list(options), guesses)
     idx = opts.index(guess) if guess in opts else 0
     return st.sidebar.selectbox(label, opts, index=idx)
 
-name_col     = selectbox_guess("Name*",    df_raw.columns, ["name","full name","contact","person"])
-email_col    = selectbox_guess("Email",     df_raw.columns, ["email","e-mail","mail","contact email"])
-phone_col    = selectbox_guess("Phone",     df_raw.columns, ["phone","mobile","telephone","tel","phone number","cell"])
-company_col  = selectbox_guess("Company*", df_raw.columns, ["company","organisation","organization","employer"])
-role_col     = selectbox_guess("Role",      df_raw.columns, ["role","title","job title","position"])
-country_col  = selectbox_guess("Country*", df_raw.columns, ["country","nation","location","country name"])
-status_col   = selectbox_guess("Status",    df_raw.columns, ["status","stage","pipeline","funnel"])
-priority_col = selectbox_guess("Priority",  df_raw.columns, ["priority","tier","score"])
-owner_col    = selectbox_guess("Owner",     df_raw.columns, ["owner","assignee","rep","account owner"])
-lastc_col    = selectbox_guess("Last Contacted", df_raw.columns, ["last_contacted","last contacted","last touch","last reached"])
-crm_col      = selectbox_guess("Present in CRM", df_raw.columns, ["present in crm","present","crm","in crm","crm_present","crm present"])
-notes_col    = selectbox_guess("Notes",     df_raw.columns, ["notes","remarks","comment","description"])
-
-missing = [lbl for lbl, c in {"Name":name_col, "Company":company_col, "Country":country_col}.items() if not c]
-if missing:
-    st.warning("Please map required columns: " + ", ".join(missing))
-    st.stop()
-
-std = pd.DataFrame({
-    "Name": df_raw[name_col],
-    "Email": df_raw[email_col] if email_col else "",
-    "Phone": df_raw[phone_col] if phone_col else "",
-    "Company": df_raw[company_col],
-    "Role": df_raw[role_col] if role_col else "",
-    "Country": df_raw[country_col],
-    "Status": df_raw[status_col] if status_col else "",
-    "Priority": df_raw[priority_col] if priority_col else "",
-    "Owner": df_raw[owner_col] if owner_col else "",
-    "LastContacted": df_raw[lastc_col] if lastc_col else "",
-    "PresentInCRM": df_raw[crm_col] if crm_col else "",
-    "Notes": df_raw[notes_col] if notes_col else "",
-})
-
-std = std.astype(str).apply(lambda s: s.str.strip())
-
-ALIASES = {
-    "UAE":"United Arab Emirates","Abu Dhabi":"United Arab Emirates","KSA":"Saudi Arabia",
-    "USA":"United States","US":"United States","UK":"United Kingdom","Korea":"South Korea",
-}
-std["Country"] = std["Country"].replace(ALIASES)
-
-REGION = {
-    "United Arab Emirates":"MENA","Qatar":"MENA","Bahrain":"MENA","Kuwait":"MENA","Saudi Arabia":"MENA","Lebanon":"MENA",
-    "India":"APAC","Japan":"APAC","Singapore":"APAC","Indonesia":"APAC","Malaysia":"APAC","Thailand":"APAC","Philippines":"APAC","China":"APAC","South Korea":"APAC","Australia":"APAC",
-    "Germany":"EMEA","Italy":"EMEA","United Kingdom":"EMEA","France":"EMEA","Spain":"EMEA","Netherlands":"EMEA",
-    "United States":"AMER","Canada":"AMER","Mexico":"AMER","Brazil":"AMER"
-}
-std["Region"] = std["Country"].map(REGION).fillna("Other")
-
-std["EmailDomain"] = std["Email"].str.extract(r'@([^>\s,;]+)')[0].str.lower()
-GENERIC = {"gmail.com","yahoo.com","hotmail.com","outlook.com","icloud.com","proton.me","aol.com"}
-std["IsGenericDomain"] = std["EmailDomain"].isin(GENERIC)
-std["RoleNorm"] = std["Role"].str.title()
 
-std["LastContacted_dt"] = pd.to_datetime(std["LastContacted"], errors="coerce")
-std["DaysSinceContact"] = (pd.Timestamp.today().normalize() - std["LastContacted_dt"]).dt.days
+@st.cache_resource(max_entries=4, show_spinner="Normalizing…")
+def normalized(key, mapping, _df_raw):
+    return build_std(_df_raw, dict(mapping))
+
+
+if store_mode:
+    store = prospect_store()
+    if not store.count():
+        st.info("The local store is empty. Upload a file and use **Merge into local store** in the sidebar first.")
+        st.stop()
+    # Std columns map to themselves; the dataset key is set once the filters are known.
+    mapping = tuple((c, c) for c in STD_COLUMNS)
+    std_report = None
+    st.sidebar.caption(f"Local store: {store.count():,} prospects in {store.path}")
+else:
+    stream_csv = False
+    try:
+        sheet = None
+        if uploaded is not None and not uploaded.name.lower().endswith(".csv"):
+            sheet = st.sidebar.selectbox("Sheet", sheet_names(upload_key(uploaded), uploaded.getvalue()), index=0)
+        elif uploaded is not None:
+            stream_csv = st.sidebar.toggle("Stream mapped columns only", value=False,
+                                           help="Read only the mapped columns, block by block, with pyarrow. Use for very large CSV exports.")
+        dataset_key = "sample" if uploaded is None else content_key(upload_key(uploaded).encode(), sheet)
+        if stream_csv:
+            columns = csv_header(uploaded.getvalue())
+        else:
+            df_raw = load_df(uploaded, sheet, dataset_key)
+            columns = df_raw.columns
+    except Exception as e:
+        st.error(f"Couldn't read the file. Make sure it's a valid CSV/XLSX. Error: {e}")
+        st.stop()
+
+    st.sidebar.subheader("Columns")
+    name_col     = selectbox_guess("Name*",    columns, COLUMN_GUESSES["Name"])
+    email_col    = selectbox_guess("Email",     columns, COLUMN_GUESSES["Email"])
+    phone_col    = selectbox_guess("Phone",     columns, COLUMN_GUESSES["Phone"])
+    company_col  = selectbox_guess("Company*", columns, COLUMN_GUESSES["Company"])
+    role_col     = selectbox_guess("Role",      columns, COLUMN_GUESSES["Role"])
+    country_col  = selectbox_guess("Country*", columns, COLUMN_GUESSES["Country"])
+    status_col   = selectbox_guess("Status",    columns, COLUMN_GUESSES["Status"])
+    priority_col = selectbox_guess("Priority",  columns, COLUMN_GUESSES["Priority"])
+    owner_col    = selectbox_guess("Owner",     columns, COLUMN_GUESSES["Owner"])
+    lastc_col    = selectbox_guess("Last Contacted", columns, COLUMN_GUESSES["LastContacted"])
+    crm_col      = selectbox_guess("Present in CRM", columns, COLUMN_GUESSES["PresentInCRM"])
+    notes_col    = selectbox_guess("Notes",     columns, COLUMN_GUESSES["Notes"])
+
+    missing = [lbl for lbl, c in {"Name":name_col, "Company":company_col, "Country":country_col}.items() if not c]
+    if missing:
+        st.warning("Please map required columns: " + ", ".join(missing))
+        st.stop()
+
+    mapping = (
+        ("Name", name_col), ("Email", email_col), ("Phone", phone_col), ("Company", company_col),
+        ("Role", role_col), ("Country", country_col), ("Status", status_col), ("Priority", priority_col),
+        ("Owner", owner_col), ("LastContacted", lastc_col), ("PresentInCRM", crm_col), ("Notes", notes_col),
+    )
 
-YES = {"1","true","yes","y","present","in crm","crm","✓","check","checked","x"}
-NO  = {"0","false","no","n","absent","not in crm","-",""}
-crm_norm = std["PresentInCRM"].str.lower().map(lambda x: "Yes" if x in YES else ("No" if x in NO else ""))
-std["PresentInCRM"] = crm_norm
+    if stream_csv:
+        mapped = [c for c in dict.fromkeys(c for _, c in mapping) if c]
+        dataset_key = content_key(dataset_key.encode(), tuple(mapped))
+        try:
+            df_raw = load_csv_columns(uploaded, mapped, dataset_key)
+        except Exception as e:
+            st.error(f"Couldn't stream the CSV. Try turning off streaming. Error: {e}")
+            st.stop()
+
+    timer.fields["dataset"] = dataset_key[:12]
+    timer.lap("load", len(df_raw))
+
+    if uploaded is not None:
+        cs = frame_cache().stats()
+        st.sidebar.caption(f"Ingestion cache: {cs['hits']} hits · {cs['disk_hits']} disk hits · {cs['misses']} misses · {cs['memory_bytes'] / 1e6:.1f} MB in memory")
+
+    std, std_report = normalized(dataset_key, mapping, df_raw)
+    timer.lap("normalize", len(std))
+
+    if st.sidebar.button("Merge into local store", help="Add this upload to the on-disk store: records matching by email (or name+company) are updated, the rest inserted."):
+        with st.spinner("Merging…"):
+            merged = prospect_store().merge(std, dict(mapping))
+        skipped = f", {merged['skipped']:,} skipped (no email, name or company)" if merged["skipped"] else ""
+        st.sidebar.success(f"Local store: {merged['inserted']:,} new, {merged['updated']:,} updated{skipped}.")
+        timer.lap("merge", len(std))
+
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing…")
+def filter_index(key, mapping, _std):
+    return FilterIndex(_std)
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing…")
+def search_index(key, mapping, _std):
+    return SearchIndex(_std)
+
+@st.cache_resource(max_entries=2, show_spinner="Clustering duplicates…")
+def fuzzy_duplicates(key, mapping, threshold, _std):
+    return find_duplicates(_std, threshold=threshold)
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing…")
+def aggregation_cube(key, mapping, _std):
+    return AggregationCube(_std)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def view_counts(key, mapping, state, _cube, _rows):
+    return _cube.counts(_rows)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def sort_keys(key, mapping, _std):
+    return SortKeys(_std)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def view_order(key, mapping, state, column, descending, _keys, _f):
+    # Score and NextFollowUp only exist on the view; everything else sorts by the dataset's cached ranks.
+    rows = _f.index.to_numpy()
+    if column in ("Score", "NextFollowUp"):
+        return _keys.order(rows, descending=descending, values=_f[column].to_numpy())
+    return _keys.order(rows, column, descending)
+
+@st.cache_resource(max_entries=4, show_spinner="Scoring…")
+def scoring_engine(key, mapping, _std):
+    return ScoringEngine(_std)
+
+def filter_options(column):
+    # Distinct values from the store's indexes, or from the uploaded dataset.
+    if store_mode:
+        return store_options(store.version(), column)
+    values = std[column]
+    return values.cat.categories.tolist() if isinstance(values.dtype, pd.CategoricalDtype) else values.unique().tolist()
 
 st.sidebar.subheader("Filters")
-sel_regions   = st.sidebar.multiselect("Region", sorted(std["Region"].unique().tolist()))
-sel_countries = st.sidebar.multiselect("Country", sorted([c for c in std["Country"].unique() if c]))
-sel_companies = st.sidebar.multiselect("Company", sorted([c for c in std["Company"].unique() if c]))
-sel_owners    = st.sidebar.multiselect("Owner", sorted([o for o in std["Owner"].replace({"":"(unassigned)"}).unique()]))
+sel_regions   = st.sidebar.multiselect("Region", filter_options("Region"))
+sel_countries = st.sidebar.multiselect("Country", [c for c in filter_options("Country") if c])
+sel_companies = st.sidebar.multiselect("Company", sorted([c for c in filter_options("Company") if c]))
+sel_owners    = st.sidebar.multiselect("Owner", sorted([o if o else BLANK_LABELS["Owner"] for o in filter_options("Owner")]))
 sel_roles     = st.sidebar.text_input("Role contains")
-sel_domains   = st.sidebar.multiselect("Email domain", sorted([d for d in std["EmailDomain"].dropna().unique() if d]))
+sel_domains   = st.sidebar.multiselect("Email domain", [d for d in filter_options("EmailDomain") if d])
 hide_generic  = st.sidebar.toggle("Hide generic email providers", value=False)
-sel_status    = st.sidebar.multiselect("Status", sorted([s for s in std["Status"].replace({"":"(blank)"}).unique()]))
-sel_priority  = st.sidebar.multiselect("Priority", sorted([p for p in std["Priority"].replace({"":"(blank)"}).unique()]))
+sel_status    = st.sidebar.multiselect("Status", sorted([s if s else BLANK_LABELS["Status"] for s in filter_options("Status")]))
+sel_priority  = st.sidebar.multiselect("Priority", sorted([p if p else BLANK_LABELS["Priority"] for p in filter_options("Priority")]))
 crm_filter    = st.sidebar.selectbox("Present in CRM", ["All","Yes","No"], index=0)
 query         = st.sidebar.text_input("Search name/company")
+fuzzy_search  = st.sidebar.toggle("Typo-tolerant search", value=False)
 unique_emails = st.sidebar.toggle("Show unique emails only", value=False)
 
 cad_high = st.sidebar.slider("High priority follow-up (days)", 7, 60, 14)
 cad_med  = st.sidebar.slider("Medium priority follow-up (days)", 7, 90, 30)
 cad_low  = st.sidebar.slider("Low priority follow-up (days)", 7, 120, 45)
 
-f = std.copy()
-if sel_regions:
-    f = f[f["Region"].isin(sel_regions)]
-if sel_countries:
-    f = f[f["Country"].isin(sel_countries)]
-if sel_companies:
-    f = f[f["Company"].isin(sel_companies)]
-if sel_owners:
-    owners = [o if o != "(unassigned)" else "" for o in sel_owners]
-    f = f[f["Owner"].isin(owners)]
-if sel_roles:
-    f = f[f["Role"].str.contains(sel_roles, case=False, na=False)]
-if sel_domains:
-    f = f[f["EmailDomain"].isin(sel_domains)]
-if hide_generic:
-    f = f[~f["IsGenericDomain"]]
-if sel_status:
-    st_status = [s if s != "(blank)" else "" for s in sel_status]
-    f = f[f["Status"].isin(st_status)]
-if sel_priority:
-    st_pr = [p if p != "(blank)" else "" for p in sel_priority]
-    f = f[f["Priority"].isin(st_pr)]
-if crm_filter != "All":
-    f = f[f["PresentInCRM"] == crm_filter]
-if query:
-    mask = f["Name"].str.contains(query, case=False, na=False) | f["Company"].str.contains(query, case=False, na=False)
-    f = f[mask]
-if unique_emails:
-    f = f.sort_values("Email").drop_duplicates(subset=["Email"], keep="first")
-
-PR_MAP = {"high":3, "med":2, "medium":2, "low":1}
-role_ceo_bonus = 2
-non_generic_bonus = 1
-priority_points = f["Priority"].str.lower().map(PR_MAP).fillna(0)
-ceo_points = f["Role"].str.contains("CEO", case=False, na=False).astype(int) * role_ceo_bonus
-non_gen_points = (~f["IsGenericDomain"]).astype(int) * non_generic_bonus
-recency_points = (-f["DaysSinceContact"].fillna(60) / 60.0).clip(-1, 0)
-f["Score"] = (priority_points + ceo_points + non_gen_points + recency_points).round(2)
-
-cadence_map = f["Priority"].str.lower().map({"high":cad_high, "med":cad_med, "medium":cad_med, "low":cad_low}).fillna(cad_low)
-f["NextFollowUp"] = f["LastContacted_dt"] + pd.to_timedelta(cadence_map, unit="D")
-f["Overdue"] = (pd.Timestamp.today().normalize() > f["NextFollowUp"]).fillna(False)
-
-col1,col2,col3,col4,col5,col6 = st.columns(6)
-col1.metric("Prospects", f"{len(f):,}")
-col2.metric("Countries", f"{f['Country'].nunique():,}")
-col3.metric("Companies", f"{f['Company'].nunique():,}")
-col4.metric("CEOs", f"{f['Role'].str.contains('CEO', case=False, na=False).sum():,}")
-col5.metric("Unique domains", f"{f['EmailDomain'].nunique():,}")
-col6.metric("Overdue follow-ups", int(f["Overdue"].sum()))
-
-(tab_overview, tab_map, tab_companies, tab_roles, tab_funnel, tab_quality, tab_contacts, tab_tools) = st.tabs([
-    "Overview","Map","Companies","Roles","Funnel","Data Quality","Contacts","Tools"])
+# Everything that decides which rows are in the filtered view (keys cached aggregates), and also
+# the values shown for them (keys cached exports and lists).
+view_state = (
+    tuple(sel_regions), tuple(sel_countries), tuple(sel_companies), tuple(sel_owners), sel_roles, tuple(sel_domains),
+    hide_generic, tuple(sel_status), tuple(sel_priority), crm_filter, query, fuzzy_search, unique_emails,
+)
+filter_state = view_state + (cad_high, cad_med, cad_low)
+
+filters = sidebar_filters({
+    "Region": sel_regions,
+    "Country": sel_countries,
+    "Company": sel_companies,
+    "Owner": sel_owners,
+    "EmailDomain": sel_domains,
+    "Status": sel_status,
+    "Priority": sel_priority,
+}, hide_generic, crm_filter)
+rows_loaded = True
+if store_mode:
+    # Filters and exact search run in SQLite. Views of up to LOAD_MAX_ROWS records are loaded for the
+    # row-level tabs and for typo-tolerant search, which has no SQL equivalent; larger views are only
+    # counted, aggregated and paged in SQL.
+    store_query = "" if fuzzy_search else query
+    matched = stored_count(store.version(), filters, store_query, sel_roles)
+    if matched > LOAD_MAX_ROWS and store_query != query:
+        store_query = query
+        matched = stored_count(store.version(), filters, store_query, sel_roles)
+    rows_loaded = matched <= LOAD_MAX_ROWS
+    dataset_key = content_key(f"store:{store.path}:{store.version()}".encode(), (tuple(filters.items()), store_query, sel_roles))
+    timer.fields["dataset"] = dataset_key[:12]
+    timer.lap("store query", matched)
+    if rows_loaded:
+        std = stored_view(dataset_key, filters, store_query, sel_roles)
+        fidx = filter_index(dataset_key, mapping, std)
+        timer.lap("index", len(std))
+        rows = np.arange(len(std))
+        if query and store_query != query:
+            rows = rows[search_index(dataset_key, mapping, std).search(rows, query, fuzzy=True) > 0]
+    else:
+        std = rows = None
+        st.sidebar.info(f"{matched:,} prospects match, more than {LOAD_MAX_ROWS:,}: totals, charts and the list are queried from the store. "
+                        "Narrow the filters to use the Data Quality, Contacts and Tools tabs, typo-tolerant search and unique emails.")
+else:
+    fidx = filter_index(dataset_key, mapping, std)
+    timer.lap("index", len(std))
+    rows = fidx.rows(fidx.select(filters))
+    if sel_roles:
+        rows = rows[search_index(dataset_key, mapping, std).search(rows, sel_roles, fields=("Role",)) > 0]
+    if query:
+        rows = rows[search_index(dataset_key, mapping, std).search(rows, query, fuzzy=fuzzy_search) > 0]
+if rows is not None:
+    timer.lap("filter", len(rows))
+# Totals and chart counts come straight from SQL unless the view was narrowed further in pandas.
+pushed_down = store_mode and (not rows_loaded or (not unique_emails and store_query == query))
+cadence = {"high": cad_high, "med": cad_med, "low": cad_low}
+
+TABS = ["Overview","Map","Companies","Roles","Funnel","Data Quality","Contacts","Tools"]
+BASE_COLUMNS = ["Name","Email","Company","Role","Country","Priority","EmailDomain","IsGenericDomain","LastContacted_dt"]
+TAB_COLUMNS = {
+    "Overview": ["Phone","Region","Status","Owner","LastContacted","PresentInCRM","Notes"],
+    "Companies": ["Region"],
+    "Roles": ["RoleNorm"],
+    "Funnel": ["Status"],
+    "Contacts": ["Phone","Owner","LastContacted","PresentInCRM","Notes"],
+    "Tools": None,
+}
+
+kpis = st.container()
+(tab_overview, tab_map, tab_companies, tab_roles, tab_funnel, tab_quality, tab_contacts, tab_tools) = tabs = st.tabs(TABS, key="tab", on_change="rerun")
+active_tab = next((label for label, t in zip(TABS, tabs) if t.open), TABS[0])
+extra = TAB_COLUMNS.get(active_tab, [])
+if rows_loaded:
+    f = fidx.take(rows, None if extra is None else BASE_COLUMNS + extra)
+    if unique_emails:
+        f = f.sort_values("Email").drop_duplicates(subset=["Email"], keep="first")
+    timer.lap("gather", len(f))
+
+    # Score is precomputed per dataset; moving a cadence slider only recomputes the follow-up columns.
+    f = f.assign(**scoring_engine(dataset_key, mapping, std).columns(f.index.to_numpy(), cadence))
+    timer.lap("scoring", len(f))
+    view_rows = len(f)
+else:
+    f = None
+    view_rows = matched
+
+if pushed_down:
+    k = stored_kpis(dataset_key, tuple(cadence.items()), pd.Timestamp.today().date(), filters, store_query, sel_roles)
+else:
+    k = {
+        "Prospects": len(f), "Countries": f["Country"].nunique(), "Companies": f["Company"].nunique(),
+        "CEOs": f["Role"].str.contains("CEO", case=False, na=False).sum(), "Domains": f["EmailDomain"].nunique(),
+        "Overdue": f["Overdue"].sum(),
+    }
+col1,col2,col3,col4,col5,col6 = kpis.columns(6)
+col1.metric("Prospects", f"{k['Prospects']:,}")
+col2.metric("Countries", f"{k['Countries']:,}")
+col3.metric("Companies", f"{k['Companies']:,}")
+col4.metric("CEOs", f"{k['CEOs']:,}")
+col5.metric("Unique domains", f"{k['Domains']:,}")
+col6.metric("Overdue follow-ups", int(k["Overdue"]))
+timer.lap("kpis", view_rows)
+
+def counts():
+    # Prospects per Region×Country×Company×Status×Role×Owner for the current view, shared by every chart.
+    if pushed_down:
+        return stored_counts(dataset_key, filters, store_query, sel_roles)
+    return view_counts(dataset_key, mapping, view_state, aggregation_cube(dataset_key, mapping, std), f.index.to_numpy())
+
+def rows_available():
+    # Row-level tabs need the view in pandas; past LOAD_MAX_ROWS the store only answers totals, counts and pages.
+    if not rows_loaded:
+        st.info(f"{matched:,} prospects match. Narrow the filters or search to {LOAD_MAX_ROWS:,} or fewer to use this tab.")
+    return rows_loaded
 
 with tab_overview:
-    st.subheader("Prospect List")
-    visible_cols = st.multiselect(
-        "Columns to display",
-        ["Name","Email","Phone","Company","Role","Country","Region","Status","Priority","Owner","LastContacted","NextFollowUp","PresentInCRM","Score","Notes"],
-        default=["Name","Email","Phone","Company","Role","Country","Region","Status","Priority","Owner","PresentInCRM","Score"],
-    )
-    tbl = f.sort_values(["Region","Country","Company","Name"]).reset_index(drop=True).copy()
-    tbl["Email"] = tbl["Email"].apply(lambda x: f"[{x}](mailto:{x})" if isinstance(x,str) and "@" in x else x)
-    tbl["Phone"] = tbl["Phone"].apply(lambda x: f"[{x}](tel:{x})" if isinstance(x,str) and len(x.strip())>0 else x)
-    st.data_editor(
-        tbl[visible_cols],
-        hide_index=True,
-        use_container_width=True,
-        column_config={
-            "Email": st.column_config.LinkColumn("Email"),
-            "Phone": st.column_config.LinkColumn("Phone"),
-        },
-        num_rows="dynamic",
-    )
-
-    st.subheader("Charts")
-    if not f.empty:
-        by_region = f.groupby("Region").size().reset_index(name="Prospects").sort_values("Prospects", ascending=False)
-        st.plotly_chart(px.bar(by_region, x="Region", y="Prospects", title="Prospects by Region"), use_container_width=True)
-        by_country = f.groupby("Country").size().reset_index(name="Prospects").sort_values("Prospects", ascending=False)
-        st.plotly_chart(px.bar(by_country.head(20), x="Country", y="Prospects", title="Top Countries"), use_container_width=True)
-        by_company = f.groupby("Company").size().reset_index(name="Prospects").sort_values("Prospects", ascending=False)
-        st.plotly_chart(px.treemap(by_company, path=["Company"], values="Prospects", title="Company Treemap"), use_container_width=True)
-    else:
-        st.info("No rows match your filters.")
+    if tab_overview.open:
+        st.subheader("Prospect List")
+        visible_cols = st.multiselect(
+            "Columns to display",
+            ["Name","Email","Phone","Company","Role","Country","Region","Status","Priority","Owner","LastContacted","NextFollowUp","PresentInCRM","Score","Notes"],
+            default=["Name","Email","Phone","Company","Role","Country","Region","Status","Priority","Owner","PresentInCRM","Score"],
+        )
+        default_order = "Region → Country → Company → Name"
+        s1, s2, s3, s4 = st.columns([3, 1, 1, 1])
+        # Score and NextFollowUp are computed per view, so a store-only view can't be sorted by them.
+        sortable = visible_cols if rows_loaded else [c for c in visible_cols if c not in ("Score", "NextFollowUp")]
+        sort_by = s1.selectbox("Sort by", [default_order] + sortable)
+        sort_column = None if sort_by == default_order else sort_by
+        descending = s2.toggle("Descending", value=False)
+        page_size = s3.selectbox("Rows per page", PAGE_SIZES, index=1)
+        pages = page_bounds(view_rows, 1, page_size)[2]
+        page_no = s4.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1)
+        start, stop, _ = page_bounds(view_rows, page_no, page_size)
+        # Only the visible page is gathered, link-formatted and sent to the browser.
+        if rows_loaded:
+            order = view_order(dataset_key, mapping, filter_state, sort_column, descending, sort_keys(dataset_key, mapping, std), f)
+            table_page = f.iloc[order[start:stop]]
+        else:
+            # LIMIT/OFFSET on the store; scores are computed for these rows alone.
+            table_page = score_frame(store.page(filters, store_query, sel_roles, sort_column, descending, start, stop - start), cadence)
+        st.data_editor(
+            link_columns(table_page[visible_cols]),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Email": st.column_config.LinkColumn("Email"),
+                "Phone": st.column_config.LinkColumn("Phone"),
+            },
+        )
+        st.caption(f"Rows {start + 1 if stop else 0:,}–{stop:,} of {view_rows:,}")
+        timer.lap("table", stop - start)
+
+        st.subheader("Charts")
+        if view_rows:
+            cube = counts()
+            st.plotly_chart(px.bar(rollup(cube, ["Region"]), x="Region", y="Prospects", title="Prospects by Region"), use_container_width=True)
+            st.plotly_chart(px.bar(rollup(cube, ["Country"]).head(20), x="Country", y="Prospects", title="Top Countries"), use_container_width=True)
+            by_company = top_n(rollup(cube, ["Company"]), "Company")
+            st.plotly_chart(px.treemap(by_company, path=["Company"], values="Prospects", title="Company Treemap"), use_container_width=True)
+        else:
+            st.info("No rows match your filters.")
+        timer.lap("charts", view_rows)
 
 with tab_map:
-    st.subheader("Prospects by Country (Map)")
-    by_country = f.groupby("Country").size().reset_index(name="Prospects")
-    if not by_country.empty:
-        try:
-            figm = px.choropleth(by_country, locations="Country", locationmode="country names", color="Prospects")
+    if tab_map.open:
+        st.subheader("Prospects by Country (Map)")
+        by_country = rollup(counts(), ["Country"])
+        if not by_country.empty:
+            # Countries are resolved to ISO-3166 names during normalization, so the codes are exact.
+            by_country["ISO3"] = by_country["Country"].astype(str).map(ISO3)
+            figm = px.choropleth(by_country.dropna(subset=["ISO3"]), locations="ISO3", hover_name="Country", color="Prospects")
             st.plotly_chart(figm, use_container_width=True)
-        except Exception:
-            st.info("Some country names were not recognized. Consider using full names, e.g., 'United States'.")
-    else:
-        st.info("No data to show on the map.")
+            off_map = int(by_country.loc[by_country["ISO3"].isna(), "Prospects"].sum())
+            if off_map:
+                st.caption(f"{off_map:,} prospects with a blank or unrecognized country are not shown; see Data Quality.")
+        else:
+            st.info("No data to show on the map.")
+        timer.lap("charts", view_rows)
 
 with tab_companies:
-    st.subheader("Company summary")
-    comp = (
-        f.groupby("Company").agg(
-            Prospects=("Company","size"),
-            Countries=("Country", "nunique"),
-            Regions=("Region", "nunique"),
-        ).reset_index().sort_values("Prospects", ascending=False)
-    )
-    st.dataframe(comp, use_container_width=True)
-    if not comp.empty:
-        st.plotly_chart(px.bar(comp.head(30), x="Company", y="Prospects", title="Top Companies"), use_container_width=True)
-        st.plotly_chart(px.sunburst(f, path=["Region","Country","Company"], title="Region → Country → Company"), use_container_width=True)
+    if tab_companies.open:
+        st.subheader("Company summary")
+        cube = counts()
+        comp = company_summary(cube)
+        st.dataframe(comp, use_container_width=True)
+        if not comp.empty:
+            st.plotly_chart(px.bar(comp.head(30), x="Company", y="Prospects", title="Top Companies"), use_container_width=True)
+            by_path = top_n(rollup(cube, ["Region","Country","Company"]), "Company")
+            st.plotly_chart(px.sunburst(by_path, path=["Region","Country","Company"], values="Prospects", title="Region → Country → Company"), use_container_width=True)
+        timer.lap("charts", view_rows)
 
 with tab_roles:
-    st.subheader("Role distribution")
-    rc = f["RoleNorm"].replace({"":np.nan}).dropna().value_counts().reset_index()
-    rc.columns = ["Role","Prospects"]
-    if not rc.empty:
-        st.plotly_chart(px.bar(rc.head(30), x="Role", y="Prospects", title="Top Roles"), use_container_width=True)
-    else:
-        st.info("No roles found.")
+    if tab_roles.open:
+        st.subheader("Role distribution")
+        rc = rollup(counts(), ["RoleNorm"]).rename(columns={"RoleNorm": "Role"})
+        rc = rc[rc["Role"] != ""]
+        if not rc.empty:
+            st.plotly_chart(px.bar(rc.head(30), x="Role", y="Prospects", title="Top Roles"), use_container_width=True)
+        else:
+            st.info("No roles found.")
+        timer.lap("charts", view_rows)
 
 with tab_funnel:
-    st.subheader("Pipeline funnel")
-    order = ["New","Contacted","Replied","Meeting","Qualified","Won","Lost"]
-    funnel = f["Status"].replace({"":"(blank)"}).value_counts().reindex(order + [s for s in f["Status"].unique() if s not in order], fill_value=0)
-    df_funnel = funnel.reset_index(); df_funnel.columns = ["Stage","Prospects"]
-    st.plotly_chart(px.bar(df_funnel, x="Stage", y="Prospects", title="Prospects by Stage"), use_container_width=True)
+    if tab_funnel.open:
+        st.subheader("Pipeline funnel")
+        order = ["New","Contacted","Replied","Meeting","Qualified","Won","Lost"]
+        counts_by_stage = rollup(counts(), ["Status"])
+        stages = counts_by_stage.set_index(counts_by_stage["Status"].astype(str).replace({"": "(blank)"}))["Prospects"]
+        funnel = stages.reindex(order + [s for s in stages.index if s not in order], fill_value=0)
+        df_funnel = funnel.reset_index(); df_funnel.columns = ["Stage","Prospects"]
+        st.plotly_chart(px.bar(df_funnel, x="Stage", y="Prospects", title="Prospects by Stage"), use_container_width=True)
+        timer.lap("charts", view_rows)
 
 with tab_quality:
-    st.subheader("Data quality checks")
-    invalid_email = ~std["Email"].str.contains(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", case=False, na=False)
-    missing_email = (std["Email"].eq("") | std["Email"].isna())
-    dup_by_email = std["Email"].str.lower().duplicated(keep=False) & std["Email"].str.contains("@", na=False)
-    dup_name_company = std.assign(_key=(std["Name"].str.lower()+"|"+std["Company"].str.lower()))._key.duplicated(keep=False)
-
-    c1,c2,c3,c4 = st.columns(4)
-    c1.metric("Invalid emails", int(invalid_email.sum()))
-    c2.metric("Missing emails", int(missing_email.sum()))
-    c3.metric("Duplicate emails", int(dup_by_email.sum()))
-    c4.metric("Dup name+company", int(dup_name_company.sum()))
-
-    with st.expander("Show invalid or missing emails"):
-        st.dataframe(std[invalid_email | missing_email][["Name","Email","Phone","Company","Country","Role"]], use_container_width=True)
-    with st.expander("Show duplicate emails"):
-        st.dataframe(std[dup_by_email][["Name","Email","Company","Country","Role"]].sort_values("Email"), use_container_width=True)
-    with st.expander("Show duplicate name+company"):
-        st.dataframe(std[dup_name_company][["Name","Company","Email","Country","Role"]].sort_values(["Company","Name"]), use_container_width=True)
+    if tab_quality.open and rows_available():
+        st.subheader("Data quality checks")
+        if store_mode:
+            st.caption(f"Checks cover the {len(std):,} stored prospects matching the sidebar filters and search.")
+        invalid_email = ~std["Email"].str.contains(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", case=False, na=False)
+        missing_email = (std["Email"].eq("") | std["Email"].isna())
+        dup_by_email = std["Email"].str.lower().duplicated(keep=False) & std["Email"].str.contains("@", na=False)
+        dup_name_company = std.assign(_key=(std["Name"].str.lower()+"|"+std["Company"].str.lower()))._key.duplicated(keep=False)
+
+        c1,c2,c3,c4 = st.columns(4)
+        c1.metric("Invalid emails", int(invalid_email.sum()))
+        c2.metric("Missing emails", int(missing_email.sum()))
+        c3.metric("Duplicate emails", int(dup_by_email.sum()))
+        c4.metric("Dup name+company", int(dup_name_company.sum()))
+
+        country_counts = std["Country"].value_counts()
+        country_counts = country_counts[country_counts > 0]
+        unknown_countries = country_counts[unresolved(country_counts.index)]
+        k1, k2 = st.columns(2)
+        k1.metric("Unrecognized countries", f"{len(unknown_countries):,}", help="Distinct Country values that don't match an ISO-3166 name, code or alias.")
+        k2.metric("Missing countries", int(country_counts.get("", 0)))
+
+        with st.expander("Show unrecognized countries"):
+            st.dataframe(unknown_countries.rename_axis("Country").reset_index(name="Prospects"), hide_index=True, use_container_width=True)
+        with st.expander("Show invalid or missing emails"):
+            st.dataframe(std[invalid_email | missing_email][["Name","Email","Phone","Company","Country","Role"]], use_container_width=True)
+        with st.expander("Show duplicate emails"):
+            st.dataframe(std[dup_by_email][["Name","Email","Company","Country","Role"]].sort_values("Email"), use_container_width=True)
+        with st.expander("Show duplicate name+company"):
+            st.dataframe(std[dup_name_company][["Name","Company","Email","Country","Role"]].sort_values(["Company","Name"]), use_container_width=True)
+
+        st.markdown("**Fuzzy duplicates**")
+        fz1, fz2 = st.columns([1, 3])
+        find_fuzzy = fz1.toggle("Find fuzzy duplicates", value=False)
+        fuzzy_threshold = fz2.slider("Match threshold", 0.5, 1.0, MATCH_THRESHOLD, 0.01)
+        if find_fuzzy:
+            dup_pairs, dup_clusters, dup_preview = fuzzy_duplicates(dataset_key, mapping, fuzzy_threshold, std)
+            d1, d2, d3 = st.columns(3)
+            d1.metric("Duplicate clusters", f"{len(dup_preview):,}")
+            d2.metric("Records in clusters", f"{len(dup_clusters):,}")
+            d3.metric("Matching pairs", f"{len(dup_pairs):,}")
+            st.caption("Merge preview: one row per cluster, keeping the most complete value of each field.")
+            st.dataframe(dup_preview, hide_index=True, use_container_width=True)
+            with st.expander("Show matching pairs"):
+                left = std.iloc[dup_pairs["A"].to_numpy()][["Name","Company","Email"]].reset_index(drop=True)
+                right = std.iloc[dup_pairs["B"].to_numpy()][["Name","Company","Email"]].reset_index(drop=True)
+                st.dataframe(
+                    pd.concat([left.add_suffix(" A"), right.add_suffix(" B"), dup_pairs[["Score"]]], axis=1).sort_values("Score", ascending=False),
+                    hide_index=True, use_container_width=True,
+                )
+
+        if std_report is not None:
+            with st.expander("Memory footprint"):
+                saved = std_report["Saved"].sum()
+                st.caption(f"Normalized frame uses {std_report['Bytes'].sum() / 1e6:.2f} MB, {saved / 1e6:.2f} MB less than object dtype. "
+                           f"LastContacted format: {std_report.attrs.get('date_format') or 'inferred per value'}")
+                st.dataframe(std_report, hide_index=True, use_container_width=True)
+        timer.lap("data quality", len(std))
 
 with tab_contacts:
-    st.subheader("Quick contact finder")
-    q = st.text_input("Search by name or company")
-    dfc = f.copy()
-    if q:
-        m = dfc["Name"].str.contains(q, case=False, na=False) | dfc["Company"].str.contains(q, case=False, na=False)
-        dfc = dfc[m]
-    if dfc.empty:
-        st.info("No contacts match your search or filters.")
-    else:
-        for _, row in dfc.sort_values(["Score"], ascending=False).head(60).iterrows():
-            contact_line = ""
-            if isinstance(row["Email"], str) and "@" in row["Email"]:
-                contact_line = f"📧 <a href=\"mailto:{row['Email']}\">{row['Email']}</a>"
-            elif isinstance(row["Phone"], str) and row["Phone"].strip():
-                contact_line = f"📞 <a href=\"tel:{row['Phone']}\">{row['Phone']}</a>"
-            else:
-                contact_line = "📭 —"
-
-            with st.container():
-                st.markdown(
-                    f"""
-                    <div class='contact-card'>
-                      <div style='display:flex; justify-content:space-between; align-items:center;'>
-                        <div>
-                          <div style='font-weight:700;font-size:18px'>{row['Name']}</div>
-                          <div class='tiny'>{row['Role']} • {row['Company']}</div>
-                          <div class='tiny'>{row['Country']} · Owner: {row['Owner'] if row['Owner'] else '—'} · CRM: {row['PresentInCRM'] if row['PresentInCRM'] else '—'}</div>
-                        </div>
-                        <div><span class='badge'>Score {row['Score']}</span></div>
-                      </div>
-                      <div style='margin-top:8px'>
-                        {contact_line}
-                      </div>
-                      <div class='tiny' style='margin-top:6px'>Last contacted: {row['LastContacted'] if row['LastContacted'] else '—'} · Next follow-up: {row['NextFollowUp'].date() if pd.notnull(row['NextFollowUp']) else '—'} {('· OVERDUE' if row['Overdue'] else '')}</div>
-                      <div style='margin-top:6px' class='tiny'>{row['Notes'] if row['Notes'] else ''}</div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
+    if tab_contacts.open and rows_available():
+        st.subheader("Quick contact finder")
+        q = st.text_input("Search by name or company")
+        keys = {"Score": f["Score"].to_numpy()}
+        if q:
+            keys = {"Match": search_index(dataset_key, mapping, std).search(f.index.to_numpy(), q, fuzzy=fuzzy_search), **keys}
+        hits = int((keys["Match"] > 0).sum()) if q else len(f)
+        if not hits:
+            st.info("No contacts match your search or filters.")
+        else:
+            p1, p2 = st.columns([1, 1])
+            card_page_size = p1.selectbox("Cards per page", CARD_PAGE_SIZES, index=1)
+            card_pages = page_bounds(hits, 1, card_page_size)[2]
+            card_page = p2.number_input(f"Page (of {card_pages:,})", min_value=1, max_value=card_pages, value=1, step=1, key="card_page")
+            start, stop, _ = page_bounds(hits, card_page, card_page_size)
+            # Only the best `stop` rows are ranked; the page is rendered as one HTML block.
+            best = top_k(keys, stop)[start:]
+            st.markdown(cards_html(f.iloc[best]), unsafe_allow_html=True)
+            st.caption(f"Contacts {start + 1:,}–{stop:,} of {hits:,}")
+        timer.lap("cards", len(f))
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def filtered_export(key, mapping, state, template, fmt, _f):
+    # Runs on download, after the rerun's timer is gone, so it logs its own stage. Only the latest
+    # file is kept: a full-list export can be hundreds of MB.
+    with StageTimer(dataset=key[:12], format=fmt, template=template).stage("export", len(_f)):
+        return export_bytes(_f, fmt, template)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def filtered_list(key, mapping, state, column, _f):
+    if column == "Email":
+        return contact_list(_f["Email"], lambda e: "@" in e)
+    return contact_list(_f[column], lambda p: bool(p.strip()))
 
 with tab_tools:
-    st.subheader("Toolbox")
-
-    st.markdown("**Copy email list (filtered)**")
-    emails = ", ".join(sorted([e for e in f["Email"].dropna().unique() if "@" in e]))
-    st.text_area("Emails", emails, height=120)
-
-    st.markdown("**Copy phone list (filtered)**")
-    phones = ", ".join(sorted([p for p in f["Phone"].dropna().unique() if str(p).strip()]))
-    st.text_area("Phones", phones, height=120)
-
-    st.markdown("**CRM export format**")
-    template = st.selectbox("Choose template", ["None","Salesforce","HubSpot"])
-    export_df = f.copy()
-    if template == "Salesforce":
-        export_df = export_df.rename(columns={
-            "Name":"FullName","Email":"Email","Phone":"Phone","Company":"AccountName","Role":"Title","Country":"Country",
-            "Status":"LeadStatus","Priority":"Rating","Owner":"Owner","Notes":"Description","PresentInCRM":"PresentInCRM"
-        })[["FullName","Title","Email","Phone","AccountName","Country","LeadStatus","Rating","Owner","NextFollowUp","PresentInCRM","Description"]]
-    elif template == "HubSpot":
-        export_df = export_df.rename(columns={
-            "Name":"firstname lastname","Email":"email","Phone":"phone","Company":"company","Role":"jobtitle","Country":"country",
-            "Status":"lifecyclestage","Priority":"hs_lead_rating","Owner":"hubspot_owner_id","Notes":"notes","PresentInCRM":"present_in_crm"
-        })[["firstname lastname","jobtitle","email","phone","company","country","lifecyclestage","hs_lead_rating","hubspot_owner_id","NextFollowUp","present_in_crm","notes"]]
-
-    colA,colB = st.columns([1,1])
-    with colA:
-        st.download_button("Download filtered CSV", export_df.to_csv(index=False).encode("utf-8"), "prospects_filtered.csv", "text/csv")
-    with colB:
-        buf = io.BytesIO()
-        with pd.ExcelWriter(buf, engine="xlsxwriter") as wr:
-            export_df.to_excel(wr, index=False, sheet_name="Prospects")
-        st.download_button("Download filtered Excel", buf.getvalue(), "prospects_filtered.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    if tab_tools.open and rows_available():
+        st.subheader("Toolbox")
+
+        for column, title in [("Email", "Copy email list (filtered)"), ("Phone", "Copy phone list (filtered)")]:
+            lst = st.expander(title, key=f"list_{column}", on_change="rerun")
+            with lst:
+                if lst.open:
+                    st.text_area(f"{column}s", filtered_list(dataset_key, mapping, filter_state, column, f), height=120)
+
+        st.markdown("**CRM export format**")
+        template = st.selectbox("Choose template", ["None"] + list(TEMPLATES))
+        st.caption(f"{len(f):,} rows. Files are built when you click download and reused until the filters change.")
+
+        # Deferred downloads: the file is only generated on click, then cached for this filter state and template.
+        for col, fmt in zip(st.columns(len(FORMATS)), FORMATS):
+            ext, mime = FORMATS[fmt]
+            too_big = fmt == "Excel" and len(f) > EXCEL_MAX_ROWS
+            col.download_button(
+                f"Download filtered {fmt}",
+                lambda fmt=fmt: filtered_export(dataset_key, mapping, filter_state, template, fmt, f),
+                f"prospects_filtered.{ext}", mime,
+                on_click="ignore", disabled=too_big,
+                help=f"Excel is limited to {EXCEL_MAX_ROWS:,} rows; use CSV or Parquet." if too_big else None,
+            )
+        timer.lap("tools", len(f))
+
+if st.sidebar.toggle("Show stage timings", value=False, help="Debug: time and rows per stage of this rerun, also logged as JSON lines (set PROSPECT_TIMING_LOG to write them to a file)."):
+    stage_times = timer.frame()
+    st.sidebar.dataframe(stage_times, hide_index=True, use_container_width=True)
+    st.sidebar.caption(f"Rerun total: {stage_times['ms'].sum():,.1f} ms")
@@ -0,0 +1,95 @@
+"""Compare the old Excel path (pd.ExcelFile + read_excel on every rerun) with lazy sheet discovery,
+read-only streaming and the per-sheet cache.
+
+    python benchmarks/bench_excel.py                          # 3 sheets x 245k rows, ~50 MB
+    python benchmarks/bench_excel.py --rows 20000             # quick run, ~4 MB
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ingest import FrameCache, content_key, excel_sheet_names, read_upload, strip_strings  # noqa: E402
+
+COLUMNS = ["Name", "Email", "Phone", "Company", "Role", "Country", "Status", "Priority", "Owner", "LastContacted", "Present in CRM", "Notes"]
+
+
+def make_workbook(rows, sheets, seed=0):
+    rng = np.random.default_rng(seed)
+    buf = io.BytesIO()
+    wb = xlsxwriter.Workbook(buf, {"constant_memory": True, "in_memory": True})
+    for s in range(sheets):
+        ws = wb.add_worksheet(f"Region {s + 1}")
+        ws.write_row(0, 0, COLUMNS)
+        ids = rng.integers(0, 10 ** 7, rows)
+        for i in range(rows):
+            n = int(ids[i])
+            ws.write_row(i + 1, 0, [
+                f"Person {n}", f"p{n}@company{n % 5000}.com", f"+49 30 {n:07d}", f"Company {n % 5000} GmbH",
+                ("CEO", "CTO", "Head of EV", "VP Sustainability")[n % 4], ("Germany", "Italy", "India", "USA")[n % 4],
+                ("New", "Contacted", "Replied")[n % 3], ("High", "Med", "Low")[n % 3], f"Owner {n % 12}",
+                f"2025-0{1 + n % 9}-1{n % 9}", ("Yes", "No")[n % 2], f"note {n}",
+            ])
+    wb.close()
+    return buf.getvalue()
+
+
+def timed(fn):
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t
+
+
+def old_path(data, a, b):
+    def select(sheet):
+        xls = pd.ExcelFile(io.BytesIO(data))
+        xls.sheet_names
+        strip_strings(pd.read_excel(xls, sheet_name=sheet))
+    return {
+        "list sheets": timed(lambda: pd.ExcelFile(io.BytesIO(data)).sheet_names),
+        f"open {a}": timed(lambda: select(a)),
+        f"switch to {b}": timed(lambda: select(b)),
+        f"switch back to {a}": timed(lambda: select(a)),
+    }
+
+
+def new_path(data, a, b):
+    cache = FrameCache(directory=tempfile.mkdtemp(prefix="bench-excel-"))
+    key = content_key(data)
+
+    def select(sheet):
+        cache.get_or_load(content_key(key.encode(), sheet), lambda: read_upload("bench.xlsx", data, sheet, key))
+    return {
+        "list sheets": timed(lambda: excel_sheet_names(data)),
+        f"open {a}": timed(lambda: select(a)),
+        f"switch to {b}": timed(lambda: select(b)),
+        f"switch back to {a}": timed(lambda: select(a)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=245_000, help="rows per sheet")
+    parser.add_argument("--sheets", type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_workbook(args.rows, args.sheets)
+    names = excel_sheet_names(data)
+    print(f"workbook: {len(data) / 1e6:.1f} MB, {args.sheets} sheets x {args.rows:,} rows")
+    old, new = old_path(data, names[0], names[-1]), new_path(data, names[0], names[-1])
+    print(f"{'step':<28}{'current (s)':>12}{'new (s)':>12}")
+    for step in old:
+        print(f"{step:<28}{old[step]:>12.3f}{new[step]:>12.3f}")
+    print(f"{'total':<28}{sum(old.values()):>12.3f}{sum(new.values()):>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
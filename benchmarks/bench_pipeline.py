@@ -0,0 +1,119 @@
+"""Time every stage of the explorer's hot path on synthetic prospect lists.
+
+    python benchmarks/bench_pipeline.py                              # 10k, 100k and 1M rows
+    python benchmarks/bench_pipeline.py --sizes 10000 100000 --json run.json
+    python benchmarks/bench_pipeline.py --baseline run.json          # exit 1 on regressions
+
+Stages mirror a rerun after upload: read the CSV, build std, build the indexes, filter and
+search, score, aggregate for charts, sort and render a table page and a card page, export.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aggregate import AggregationCube, company_summary, rollup, top_n  # noqa: E402
+from contacts import cards_html, top_k  # noqa: E402
+from export import to_csv, to_parquet  # noqa: E402
+from filter_index import FilterIndex  # noqa: E402
+from ingest import csv_header, read_csv_columns  # noqa: E402
+from normalize import build_std, guess_mapping  # noqa: E402
+from paging import SortKeys, link_columns  # noqa: E402
+from scoring import ScoringEngine  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from synthetic import prospects  # noqa: E402
+from timing import StageTimer  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_MS = 20
+
+
+def run(n, seed=0):
+    data = prospects(n, seed).to_csv(index=False).encode("utf-8")
+    timer = StageTimer(bench_rows=n)
+
+    with timer.stage("read") as s:
+        mapping = guess_mapping(csv_header(data))
+        df_raw = read_csv_columns(data, [c for c in dict.fromkeys(mapping.values()) if c])
+        s["rows"] = len(df_raw)
+    with timer.stage("normalize", n):
+        std, _ = build_std(df_raw, mapping)
+    with timer.stage("filter index", n):
+        fidx = FilterIndex(std)
+    with timer.stage("search index", n):
+        sidx = SearchIndex(std)
+    with timer.stage("cube + sort keys", n):
+        cube_index = AggregationCube(std)
+        keys = SortKeys(std)
+    with timer.stage("scoring engine", n):
+        engine = ScoringEngine(std)
+
+    with timer.stage("filter") as s:
+        rows = fidx.rows(fidx.select({"Region": ["EMEA", "AMER"], "PresentInCRM": ["No"], "IsGenericDomain": [False]}))
+        rows = rows[sidx.search(rows, "sol") > 0]
+        s["rows"] = len(rows)
+    with timer.stage("gather + score", len(rows)):
+        f = fidx.take(rows).assign(**engine.columns(rows, {"high": 14, "med": 30, "low": 45}))
+    with timer.stage("aggregate", len(rows)):
+        cube = cube_index.counts(rows)
+        for dim in ("Region", "Country", "RoleNorm", "Status"):
+            rollup(cube, [dim])
+        company_summary(cube)
+        top_n(rollup(cube, ["Region", "Country", "Company"]), "Company")
+    with timer.stage("table page", len(rows)):
+        order = keys.order(rows, "Company", descending=True)
+        link_columns(f.iloc[order[:100]])
+    with timer.stage("card page", len(rows)):
+        cards_html(f.iloc[top_k({"Score": f["Score"].to_numpy()}, 60)])
+    with timer.stage("export csv", len(rows)):
+        to_csv(f, "Salesforce")
+    with timer.stage("export parquet", len(rows)):
+        to_parquet(f, "HubSpot")
+    return timer.records
+
+
+def compare(results, baseline):
+    """Stages at least REGRESSION_RATIO times (and REGRESSION_MIN_MS) slower than the baseline."""
+    before = {(r["bench_rows"], r["stage"]): r["ms"] for r in baseline}
+    slower = []
+    for r in results:
+        old = before.get((r["bench_rows"], r["stage"]))
+        if old is not None and r["ms"] > old * REGRESSION_RATIO and r["ms"] - old > REGRESSION_MIN_MS:
+            slower.append((r["bench_rows"], r["stage"], old, r["ms"]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the stage records here")
+    parser.add_argument("--baseline", help="records from an earlier --json run to compare against")
+    args = parser.parse_args()
+
+    results = []
+    for n in args.sizes:
+        results += run(n, args.seed)
+    stages = list(dict.fromkeys(r["stage"] for r in results))
+    ms = {(r["bench_rows"], r["stage"]): r["ms"] for r in results}
+    print(f"{'stage':<20}" + "".join(f"{f'{n:,} rows (ms)':>20}" for n in args.sizes))
+    for stage in stages:
+        print(f"{stage:<20}" + "".join(f"{ms[(n, stage)]:>20,.1f}" for n in args.sizes))
+    print(f"{'total':<20}" + "".join(f"{sum(ms[(n, s)] for s in stages):>20,.1f}" for n in args.sizes))
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=1)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            slower = compare(results, json.load(fh))
+        for n, stage, old, new in slower:
+            print(f"REGRESSION {stage} at {n:,} rows: {old:,.1f} ms -> {new:,.1f} ms ({new / old:.2f}x)")
+        sys.exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Synthetic prospect lists shaped like real CRM exports: skewed countries (with aliases and a few
+misspellings), company domains mixed with webmail, title-case and lowercase roles, several date
+styles and blanks.
+
+    python benchmarks/synthetic.py 100000 prospects_100k.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+FIRST = ["Aisha", "Lucas", "Priya", "Elena", "Kenji", "John", "Sara", "Juan", "Fatima", "Li", "Amira", "James", "Marco", "Sofia",
+         "Ahmed", "Yuki", "Chen", "Olga", "Pierre", "Ana", "Raj", "Hana", "Omar", "Laura", "Min", "Wei", "Nadia", "Luis", "Bruno", "Emma"]
+LAST = ["Tan", "Meyer", "Shah", "Rossi", "Sato", "Smith", "Lee", "Perez", "Noor", "Wei", "Hassan", "Park", "Bianchi", "Müller",
+        "Khan", "Suzuki", "Wang", "Ivanova", "Dubois", "Silva", "Patel", "Kim", "Haddad", "Garcia", "Nguyen", "Schmidt", "Costa"]
+COMPANY_WORDS = ["Solar", "Green", "Watt", "Volt", "Eco", "Grid", "Charge", "Motion", "Sustain", "Energy", "Blue", "Future", "Power", "Drive"]
+SUFFIXES = ["", "", " GmbH", " S.p.A.", " Ltd", " Inc.", " LLC", " SA", " Pte Ltd", " KK"]
+COUNTRIES = {
+    "United States": 14, "USA": 4, "US": 2, "Germany": 10, "Italy": 8, "United Kingdom": 7, "UK": 3, "France": 6, "Spain": 4,
+    "India": 8, "Japan": 6, "China": 5, "Singapore": 3, "United Arab Emirates": 4, "UAE": 3, "Saudi Arabia": 3, "KSA": 1,
+    "Qatar": 2, "Brazil": 3, "Mexico": 2, "Canada": 3, "Australia": 3, "South Korea": 2, "Korea": 1, "Netherlands": 2,
+    "Germnay": 0.3, "Itlay": 0.3, "Untied States": 0.3, "": 2,
+}
+ROLES = ["CEO", "ceo", "CTO", "Head of EV", "Sustainability Manager", "VP Sustainability", "Director Sustainability",
+         "Partnerships Lead", "Country Manager", "Director", "Head of Strategy", "Procurement Manager", "Fleet Manager", "Co-CEO", ""]
+WEBMAIL = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "icloud.com"]
+STATUS = {"New": 40, "Contacted": 25, "Replied": 12, "Meeting": 8, "Qualified": 6, "Won": 3, "Lost": 4, "": 2}
+PRIORITY = {"High": 25, "Med": 30, "Medium": 5, "Low": 30, "": 10}
+OWNERS = ["Bruno", "Ana", "Luis", "Wei", "Nadia", "Min", ""]
+CRM = {"Yes": 30, "No": 50, "": 10, "TRUE": 5, "x": 5}
+DATE_STYLES = ["%Y-%m-%d", "%Y-%m-%d", "%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d"]
+
+
+def _weighted(rng, table, n):
+    values = list(table)
+    p = np.array([table[v] for v in values], dtype=float)
+    return rng.choice(np.array(values, dtype=object), n, p=p / p.sum())
+
+
+def prospects(n, seed=0, companies=None, date_style=None):
+    """`n` synthetic raw rows with the sample data's column names. A few companies hold most of the rows, with a long tail."""
+    rng = np.random.default_rng(seed)
+    companies = companies or max(n // 20, 10)
+    words = np.array(COMPANY_WORDS, dtype=object)
+    company_names = np.array([f"{words[i % len(words)]}{words[(i // len(words)) % len(words)]} {i}" for i in range(companies)], dtype=object)
+    company_suffix = rng.choice(np.array(SUFFIXES, dtype=object), companies)
+    company_domain = np.array([c.split()[0].lower() + str(i) + ".com" for i, c in enumerate(company_names)], dtype=object)
+    ci = (companies * rng.random(n) ** 3).astype(np.int64)
+
+    first = rng.choice(np.array(FIRST, dtype=object), n)
+    last = rng.choice(np.array(LAST, dtype=object), n)
+    names = first + " " + last
+    local = pd.Series(first + "." + last).str.lower().to_numpy(dtype=object)
+    webmail = rng.random(n) < 0.15
+    domains = np.where(webmail, rng.choice(np.array(WEBMAIL, dtype=object), n), company_domain[ci])
+    emails = np.where(rng.random(n) < 0.08, "", local + "@" + domains)
+
+    days = rng.integers(0, 400, n)
+    dates = pd.Timestamp("2025-10-01") - pd.to_timedelta(days, unit="D")
+    style = date_style or DATE_STYLES[seed % len(DATE_STYLES)]
+    last_contacted = np.where(rng.random(n) < 0.3, "", pd.Series(dates).dt.strftime(style).to_numpy(dtype=object))
+
+    return pd.DataFrame({
+        "Name": names,
+        "Email": emails,
+        "Phone": np.where(rng.random(n) < 0.2, "", pd.Series(rng.integers(10 ** 8, 10 ** 9, n)).map("+1 {}".format).to_numpy(dtype=object)),
+        "Company": company_names[ci] + company_suffix[ci],
+        "Role": rng.choice(np.array(ROLES, dtype=object), n),
+        "Country": _weighted(rng, COUNTRIES, n),
+        "Status": _weighted(rng, STATUS, n),
+        "Priority": _weighted(rng, PRIORITY, n),
+        "Owner": rng.choice(np.array(OWNERS, dtype=object), n),
+        "LastContacted": last_contacted,
+        "Present in CRM": _weighted(rng, CRM, n),
+        "Notes": np.where(rng.random(n) < 0.7, "", "Follow up on " + rng.choice(np.array(["pilot", "pricing", "fleet", "tender"], dtype=object), n)),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", type=int)
+    parser.add_argument("output", help=".csv or .parquet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    df = prospects(args.rows, args.seed)
+    if args.output.endswith(".parquet"):
+        df.to_parquet(args.output, index=False)
+    else:
+        df.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from html import escape
+
+import pandas as pd
+
+CARD_PAGE_SIZES = [30, 60, 120, 240]
+
+
+def top_k(keys, k):
+    """Positions of the `k` best rows by `keys` ({column: array}, compared in order, largest first).
+
+    Only the winners get fully sorted; ties keep row order.
+    """
+    frame = pd.DataFrame(keys, copy=False)
+    return frame.nlargest(k, list(keys), keep="first").index.to_numpy()
+
+
+def _text(value):
+    return escape(str(value)) if isinstance(value, str) and value else ""
+
+
+def card_html(row):
+    email, phone = row["Email"], row["Phone"]
+    if isinstance(email, str) and "@" in email:
+        contact_line = f"📧 <a href=\"mailto:{escape(email)}\">{escape(email)}</a>"
+    elif isinstance(phone, str) and phone.strip():
+        contact_line = f"📞 <a href=\"tel:{escape(phone)}\">{escape(phone)}</a>"
+    else:
+        contact_line = "📭 —"
+    follow_up = row["NextFollowUp"].date() if pd.notnull(row["NextFollowUp"]) else "—"
+    return (
+        "<div class='contact-card'>"
+        "<div style='display:flex; justify-content:space-between; align-items:center;'>"
+        "<div>"
+        f"<div style='font-weight:700;font-size:18px'>{_text(row['Name'])}</div>"
+        f"<div class='tiny'>{_text(row['Role'])} • {_text(row['Company'])}</div>"
+        f"<div class='tiny'>{_text(row['Country'])} · Owner: {_text(row['Owner']) or '—'} · CRM: {_text(row['PresentInCRM']) or '—'}</div>"
+        "</div>"
+        f"<div><span class='badge'>Score {row['Score']}</span></div>"
+        "</div>"
+        f"<div style='margin-top:8px'>{contact_line}</div>"
+        f"<div class='tiny' style='margin-top:6px'>Last contacted: {_text(row['LastContacted']) or '—'} · Next follow-up: {follow_up} {'· OVERDUE' if row['Overdue'] else ''}</div>"
+        f"<div style='margin-top:6px' class='tiny'>{_text(row['Notes'])}</div>"
+        "</div>"
+    )
+
+
+def cards_html(page):
+    """All cards of one page as a single HTML block."""
+    cards = "".join(card_html(row) for row in page.to_dict("records"))
+    return f"<div style='display:flex; flex-direction:column; gap:12px'>{cards}</div>"
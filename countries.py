@@ -0,0 +1,349 @@
+import difflib
+import re
+import unicodedata
+from functools import lru_cache
+
+OTHER_REGION = "Other"
+FUZZY_MIN_CHARS = 4
+FUZZY_CUTOFF = 0.85
+# country_key forms of the fillers typed for "no country". They are blanks, never codes: "NA" is
+# Namibia's alpha-2 and "N/A" would otherwise be matched as one.
+PLACEHOLDERS = {"na", "n a", "nan", "none", "null", "nil", "unknown", "tbd", "tba", "not available", "not applicable"}
+
+# ISO 3166-1 (plus Kosovo's user-assigned XK/XKX): alpha-2, alpha-3, region, then the display
+# name and any aliases, official forms and common spellings, separated by "|".
+_TABLE = """
+AD AND EMEA Andorra
+AE ARE MENA United Arab Emirates|UAE|U.A.E.|Emirates|Abu Dhabi|Dubai
+AF AFG APAC Afghanistan|Islamic Republic of Afghanistan
+AG ATG AMER Antigua and Barbuda|Antigua
+AI AIA AMER Anguilla
+AL ALB EMEA Albania
+AM ARM EMEA Armenia
+AO AGO EMEA Angola
+AQ ATA Other Antarctica
+AR ARG AMER Argentina
+AS ASM APAC American Samoa
+AT AUT EMEA Austria|Österreich
+AU AUS APAC Australia
+AW ABW AMER Aruba
+AX ALA EMEA Åland Islands
+AZ AZE EMEA Azerbaijan
+BA BIH EMEA Bosnia and Herzegovina|Bosnia|Bosnia-Herzegovina
+BB BRB AMER Barbados
+BD BGD APAC Bangladesh
+BE BEL EMEA Belgium|Belgique|België
+BF BFA EMEA Burkina Faso
+BG BGR EMEA Bulgaria
+BH BHR MENA Bahrain
+BI BDI EMEA Burundi
+BJ BEN EMEA Benin
+BL BLM AMER Saint Barthélemy|St Barts
+BM BMU AMER Bermuda
+BN BRN APAC Brunei|Brunei Darussalam
+BO BOL AMER Bolivia|Plurinational State of Bolivia|Bolivia, Plurinational State of
+BQ BES AMER Caribbean Netherlands|Bonaire, Sint Eustatius and Saba|Bonaire
+BR BRA AMER Brazil|Brasil
+BS BHS AMER Bahamas|The Bahamas
+BT BTN APAC Bhutan
+BV BVT EMEA Bouvet Island
+BW BWA EMEA Botswana
+BY BLR EMEA Belarus
+BZ BLZ AMER Belize
+CA CAN AMER Canada
+CC CCK APAC Cocos (Keeling) Islands|Cocos Islands
+CD COD EMEA DR Congo|Democratic Republic of the Congo|Congo, The Democratic Republic of the|DRC|Congo-Kinshasa|Zaire
+CF CAF EMEA Central African Republic
+CG COG EMEA Congo|Republic of the Congo|Congo-Brazzaville|Congo Republic
+CH CHE EMEA Switzerland|Schweiz|Suisse|Svizzera
+CI CIV EMEA Côte d'Ivoire|Ivory Coast
+CK COK APAC Cook Islands
+CL CHL AMER Chile
+CM CMR EMEA Cameroon
+CN CHN APAC China|PRC|People's Republic of China|Mainland China
+CO COL AMER Colombia
+CR CRI AMER Costa Rica
+CU CUB AMER Cuba
+CV CPV EMEA Cabo Verde|Cape Verde
+CW CUW AMER Curaçao
+CX CXR APAC Christmas Island
+CY CYP EMEA Cyprus
+CZ CZE EMEA Czechia|Czech Republic|Czech Rep
+DE DEU EMEA Germany|Deutschland|Federal Republic of Germany
+DJ DJI EMEA Djibouti
+DK DNK EMEA Denmark|Danmark
+DM DMA AMER Dominica
+DO DOM AMER Dominican Republic
+DZ DZA MENA Algeria
+EC ECU AMER Ecuador
+EE EST EMEA Estonia
+EG EGY MENA Egypt
+EH ESH MENA Western Sahara
+ER ERI EMEA Eritrea
+ES ESP EMEA Spain|España
+ET ETH EMEA Ethiopia
+FI FIN EMEA Finland|Suomi
+FJ FJI APAC Fiji
+FK FLK AMER Falkland Islands|Falkland Islands (Malvinas)|Malvinas
+FM FSM APAC Micronesia|Federated States of Micronesia|Micronesia, Federated States of
+FO FRO EMEA Faroe Islands|Faroes
+FR FRA EMEA France
+GA GAB EMEA Gabon
+GB GBR EMEA United Kingdom|UK|U.K.|Great Britain|Britain|England|Scotland|Wales|Northern Ireland|United Kingdom of Great Britain and Northern Ireland
+GD GRD AMER Grenada
+GE GEO EMEA Georgia
+GF GUF AMER French Guiana
+GG GGY EMEA Guernsey
+GH GHA EMEA Ghana
+GI GIB EMEA Gibraltar
+GL GRL AMER Greenland
+GM GMB EMEA Gambia|The Gambia
+GN GIN EMEA Guinea
+GP GLP AMER Guadeloupe
+GQ GNQ EMEA Equatorial Guinea
+GR GRC EMEA Greece|Hellas
+GS SGS AMER South Georgia and the South Sandwich Islands|South Georgia
+GT GTM AMER Guatemala
+GU GUM APAC Guam
+GW GNB EMEA Guinea-Bissau
+GY GUY AMER Guyana
+HK HKG APAC Hong Kong|Hong Kong SAR
+HM HMD APAC Heard Island and McDonald Islands
+HN HND AMER Honduras
+HR HRV EMEA Croatia|Hrvatska
+HT HTI AMER Haiti
+HU HUN EMEA Hungary
+ID IDN APAC Indonesia
+IE IRL EMEA Ireland|Republic of Ireland|Eire
+IL ISR MENA Israel
+IM IMN EMEA Isle of Man
+IN IND APAC India
+IO IOT APAC British Indian Ocean Territory
+IQ IRQ MENA Iraq
+IR IRN MENA Iran|Islamic Republic of Iran|Iran, Islamic Republic of|Persia
+IS ISL EMEA Iceland
+IT ITA EMEA Italy|Italia
+JE JEY EMEA Jersey
+JM JAM AMER Jamaica
+JO JOR MENA Jordan
+JP JPN APAC Japan|Nippon
+KE KEN EMEA Kenya
+KG KGZ EMEA Kyrgyzstan|Kyrgyz Republic
+KH KHM APAC Cambodia
+KI KIR APAC Kiribati
+KM COM EMEA Comoros
+KN KNA AMER Saint Kitts and Nevis
+KP PRK APAC North Korea|Democratic People's Republic of Korea|Korea, Democratic People's Republic of|DPRK
+KR KOR APAC South Korea|Korea|Republic of Korea|Korea, Republic of|ROK
+KW KWT MENA Kuwait
+KY CYM AMER Cayman Islands
+KZ KAZ EMEA Kazakhstan
+LA LAO APAC Laos|Lao People's Democratic Republic|Lao PDR
+LB LBN MENA Lebanon
+LC LCA AMER Saint Lucia
+LI LIE EMEA Liechtenstein
+LK LKA APAC Sri Lanka
+LR LBR EMEA Liberia
+LS LSO EMEA Lesotho
+LT LTU EMEA Lithuania
+LU LUX EMEA Luxembourg
+LV LVA EMEA Latvia
+LY LBY MENA Libya
+MA MAR MENA Morocco|Maroc
+MC MCO EMEA Monaco
+MD MDA EMEA Moldova|Republic of Moldova|Moldova, Republic of
+ME MNE EMEA Montenegro
+MF MAF AMER Saint Martin|Saint Martin (French part)
+MG MDG EMEA Madagascar
+MH MHL APAC Marshall Islands
+MK MKD EMEA North Macedonia|Macedonia|Republic of North Macedonia
+ML MLI EMEA Mali
+MM MMR APAC Myanmar|Burma
+MN MNG APAC Mongolia
+MO MAC APAC Macao|Macau
+MP MNP APAC Northern Mariana Islands
+MQ MTQ AMER Martinique
+MR MRT EMEA Mauritania
+MS MSR AMER Montserrat
+MT MLT EMEA Malta
+MU MUS EMEA Mauritius
+MV MDV APAC Maldives
+MW MWI EMEA Malawi
+MX MEX AMER Mexico|México
+MY MYS APAC Malaysia
+MZ MOZ EMEA Mozambique
+NA NAM EMEA Namibia
+NC NCL APAC New Caledonia
+NE NER EMEA Niger
+NF NFK APAC Norfolk Island
+NG NGA EMEA Nigeria
+NI NIC AMER Nicaragua
+NL NLD EMEA Netherlands|The Netherlands|Holland|Nederland
+NO NOR EMEA Norway|Norge
+NP NPL APAC Nepal
+NR NRU APAC Nauru
+NU NIU APAC Niue
+NZ NZL APAC New Zealand|Aotearoa
+OM OMN MENA Oman
+PA PAN AMER Panama
+PE PER AMER Peru
+PF PYF APAC French Polynesia
+PG PNG APAC Papua New Guinea
+PH PHL APAC Philippines
+PK PAK APAC Pakistan
+PL POL EMEA Poland|Polska
+PM SPM AMER Saint Pierre and Miquelon
+PN PCN APAC Pitcairn|Pitcairn Islands
+PR PRI AMER Puerto Rico
+PS PSE MENA Palestine|State of Palestine|Palestine, State of|Palestinian Territories
+PT PRT EMEA Portugal
+PW PLW APAC Palau
+PY PRY AMER Paraguay
+QA QAT MENA Qatar
+RE REU EMEA Réunion
+RO ROU EMEA Romania
+RS SRB EMEA Serbia
+RU RUS EMEA Russia|Russian Federation
+RW RWA EMEA Rwanda
+SA SAU MENA Saudi Arabia|KSA|Kingdom of Saudi Arabia
+SB SLB APAC Solomon Islands
+SC SYC EMEA Seychelles
+SD SDN EMEA Sudan
+SE SWE EMEA Sweden|Sverige
+SG SGP APAC Singapore
+SH SHN EMEA Saint Helena|Saint Helena, Ascension and Tristan da Cunha
+SI SVN EMEA Slovenia
+SJ SJM EMEA Svalbard and Jan Mayen
+SK SVK EMEA Slovakia|Slovak Republic
+SL SLE EMEA Sierra Leone
+SM SMR EMEA San Marino
+SN SEN EMEA Senegal
+SO SOM EMEA Somalia
+SR SUR AMER Suriname
+SS SSD EMEA South Sudan
+ST STP EMEA São Tomé and Príncipe
+SV SLV AMER El Salvador
+SX SXM AMER Sint Maarten|Sint Maarten (Dutch part)
+SY SYR MENA Syria|Syrian Arab Republic
+SZ SWZ EMEA Eswatini|Swaziland
+TC TCA AMER Turks and Caicos Islands
+TD TCD EMEA Chad
+TF ATF EMEA French Southern Territories
+TG TGO EMEA Togo
+TH THA APAC Thailand
+TJ TJK EMEA Tajikistan
+TK TKL APAC Tokelau
+TL TLS APAC Timor-Leste|East Timor
+TM TKM EMEA Turkmenistan
+TN TUN MENA Tunisia
+TO TON APAC Tonga
+TR TUR EMEA Turkey|Türkiye
+TT TTO AMER Trinidad and Tobago|Trinidad
+TV TUV APAC Tuvalu
+TW TWN APAC Taiwan|Taiwan, Province of China|Republic of China
+TZ TZA EMEA Tanzania|United Republic of Tanzania|Tanzania, United Republic of
+UA UKR EMEA Ukraine
+UG UGA EMEA Uganda
+UM UMI APAC United States Minor Outlying Islands
+US USA AMER United States|U.S.|U.S.A.|United States of America|America
+UY URY AMER Uruguay
+UZ UZB EMEA Uzbekistan
+VA VAT EMEA Vatican City|Holy See|Holy See (Vatican City State)
+VC VCT AMER Saint Vincent and the Grenadines
+VE VEN AMER Venezuela|Bolivarian Republic of Venezuela|Venezuela, Bolivarian Republic of
+VG VGB AMER British Virgin Islands|Virgin Islands, British
+VI VIR AMER U.S. Virgin Islands|Virgin Islands, U.S.|US Virgin Islands
+VN VNM APAC Vietnam|Viet Nam
+VU VUT APAC Vanuatu
+WF WLF APAC Wallis and Futuna
+WS WSM APAC Samoa
+XK XKX EMEA Kosovo
+YE YEM MENA Yemen
+YT MYT EMEA Mayotte
+ZA ZAF EMEA South Africa|RSA
+ZM ZMB EMEA Zambia
+ZW ZWE EMEA Zimbabwe
+"""
+
+
+def country_key(text):
+    """Lookup form of a country string: no accents, case or punctuation, "St" spelled out."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"[.'’]", "", text.replace("&", " and "))
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    if words and words[0] == "the":
+        words = words[1:]
+    if words and words[0] == "st":
+        words[0] = "saint"
+    return " ".join(words)
+
+
+NAME = {}     # alpha-3 -> display name
+ALPHA2 = {}   # alpha-3 -> alpha-2
+REGION = {}   # alpha-3 -> region
+LOOKUP = {}   # country_key(name, alias or code) -> alpha-3
+for _line in _TABLE.strip().splitlines():
+    _a2, _a3, _region, _names = _line.split(" ", 3)
+    _names = _names.split("|")
+    NAME[_a3], ALPHA2[_a3], REGION[_a3] = _names[0], _a2, _region
+    for _key in [_a2, _a3] + _names:
+        LOOKUP.setdefault(country_key(_key), _a3)
+ISO3 = {name: a3 for a3, name in NAME.items()}  # display name -> alpha-3
+_NAME_KEYS = [k for k in LOOKUP if len(k) >= FUZZY_MIN_CHARS]
+
+
+@lru_cache(maxsize=None)
+def resolve(value):
+    """Alpha-3 code for a raw country value, or None.
+
+    Tries the exact key, then the part after the last comma ("Milan, Italy") and the part before
+    a parenthesis ("Germany (DE)"), then swapped adjacent letters ("Itlay") and finally the
+    closest name for other misspellings ("Swizerland").
+    """
+    key = country_key(value)
+    if not key or key in PLACEHOLDERS:
+        return None
+    candidates = [key, country_key(str(value).rsplit(",", 1)[-1]), country_key(str(value).split("(", 1)[0])]
+    for k in candidates:
+        if k in LOOKUP:
+            return LOOKUP[k]
+    if len(key) < FUZZY_MIN_CHARS:
+        return None
+    for i in range(len(key) - 1):
+        swapped = key[:i] + key[i + 1] + key[i] + key[i + 2:]
+        if swapped in LOOKUP:
+            return LOOKUP[swapped]
+    close = difflib.get_close_matches(key, _NAME_KEYS, n=2, cutoff=FUZZY_CUTOFF)
+    if not close:
+        return None
+    if len(close) > 1 and LOOKUP[close[0]] != LOOKUP[close[1]]:
+        # Equally close to two countries: leave it for the Data Quality report.
+        ratios = [difflib.SequenceMatcher(None, key, c).ratio() for c in close]
+        if ratios[0] == ratios[1]:
+            return None
+    return LOOKUP[close[0]]
+
+
+def is_blank(value):
+    """True for empty values, punctuation only ("-") and placeholders such as "N/A" or "unknown"."""
+    key = country_key(value)
+    return not key or key in PLACEHOLDERS
+
+
+def display_names(values):
+    """Display name for each raw value; unresolved values keep their text and placeholders become blanks."""
+    names = []
+    for v in values:
+        a3 = resolve(v)
+        names.append(NAME[a3] if a3 else "" if is_blank(v) else v)
+    return names
+
+
+def region(name):
+    """Region of a display name; "Other" for blanks and unresolved values."""
+    return REGION.get(ISO3.get(name), OTHER_REGION)
+
+
+def unresolved(names):
+    """The non-blank values in `names` that are not display names of a resolved country."""
+    return [n for n in names if n and n not in ISO3]
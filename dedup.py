@@ -0,0 +1,219 @@
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from normalize import GENERIC
+from search_index import trigram_table
+
+LEGAL_SUFFIXES = {
+    "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "group", "holding", "holdings", "inc", "kg", "kk",
+    "limited", "llc", "llp", "ltd", "nv", "oy", "plc", "pte", "pty", "sa", "sarl", "sas", "spa", "srl", "the",
+}
+MATCH_THRESHOLD = 0.8
+WINDOW = 20
+SIGNATURE_SIZE = 32
+POOL_MIN_PAIRS = 2_000_000
+CHUNK_PAIRS = 1_000_000
+WEIGHTS = {"name": 0.55, "company": 0.35, "domain": 0.10}
+INITIALS_SIMILARITY = 0.85
+PREVIEW_COLUMNS = ["Name", "Email", "Phone", "Company", "Role", "Country", "Status", "Priority", "Owner", "PresentInCRM", "Notes"]
+
+_PUNCT = re.compile(r"[^\w\s]+")
+_MINHASH = np.random.default_rng(20240917).integers(1, 2 ** 63, size=(2, SIGNATURE_SIZE), dtype=np.uint64) | np.uint64(1)
+
+
+def company_norm(value):
+    tokens = _PUNCT.sub(" ", value.lower().replace(".", "")).split()
+    kept = [t for t in tokens if t not in LEGAL_SUFFIXES]
+    return " ".join(kept or tokens)
+
+
+def name_norm(value):
+    return " ".join(_PUNCT.sub(" ", value.lower()).split())
+
+
+def minhash(values):
+    """MinHash signature (one row per string) over padded character trigrams; all-max for empty strings."""
+    sig = np.full((len(values), SIGNATURE_SIZE), np.iinfo(np.uint64).max, dtype=np.uint64)
+    keys, owners = trigram_table([f" {v} " if v else "" for v in values])
+    if not len(keys):
+        return sig
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    for j in range(SIGNATURE_SIZE):
+        h = keys * _MINHASH[0, j] + _MINHASH[1, j]
+        sig[owners[starts], j] = np.minimum.reduceat(h, starts)
+    return sig
+
+
+def _factorized(series, fn):
+    codes, uniques = pd.factorize(series)
+    return codes, [fn(str(u)) for u in uniques]
+
+
+class Features:
+    """Per-record blocking keys and similarity inputs, stored per distinct value with row codes."""
+
+    def __init__(self, std):
+        self.n = len(std)
+        self.name_codes, names = _factorized(std["Name"], name_norm)
+        self.company_codes, companies = _factorized(std["Company"], company_norm)
+        self.name_sig = minhash(names)
+        self.company_sig = minhash([v.replace(" ", "") for v in companies])
+        self.name_empty = np.array([not v for v in names], dtype=bool)
+        self.company_empty = np.array([not v for v in companies], dtype=bool)
+
+        tokens = [v.split() for v in names]
+        self.last, _ = pd.factorize(pd.Series([t[-1] if t else "" for t in tokens], dtype=object))
+        self.initial = np.array([ord(t[0][0]) if t else 0 for t in tokens], dtype=np.int32)
+        self.abbreviated = np.array([len(t) > 1 and len(t[0]) == 1 for t in tokens], dtype=bool)
+        name_keys = np.array([f"{t[-1]} {t[0][0]}" if t else "" for t in tokens], dtype=object)
+        self.name_key = pd.factorize(pd.Series(name_keys[self.name_codes]), sort=True)[0]
+
+        company_keys = np.array([v.split()[0] if v else "" for v in companies], dtype=object)
+        self.company_key = pd.factorize(pd.Series(company_keys[self.company_codes]))[0]
+        self.company_key[np.asarray(company_keys[self.company_codes] == "")] = -1
+
+        email = std["Email"].astype(str).str.lower()
+        self.email = pd.factorize(email)[0]
+        self.email[~email.str.contains("@", regex=False).to_numpy(dtype=bool)] = -1
+        domain = std["EmailDomain"].astype(object).to_numpy()
+        generic = pd.isna(domain) | np.isin(domain, list(GENERIC))
+        self.domain = pd.factorize(pd.Series(domain))[0]
+        self.domain[generic] = -1
+
+
+def _sorted_unique(a):
+    a = np.sort(a)
+    return a[np.r_[True, a[1:] != a[:-1]]] if len(a) else a
+
+
+def candidate_pairs(feat, window=WINDOW):
+    """Sorted-neighbourhood pairs inside each block (company token, email domain, email) plus a name-key pass."""
+    n = feat.n
+    found = []
+    passes = [
+        (feat.company_key, feat.name_key),
+        (feat.domain, feat.name_key),
+        (feat.email, feat.name_key),
+        (feat.name_key, feat.company_key),
+    ]
+    for block, within in passes:
+        rows = np.flatnonzero(block >= 0)
+        order = rows[np.lexsort((within[rows], block[rows]))]
+        keys = block[order]
+        for d in range(1, min(window, len(order))):
+            same = keys[d:] == keys[:-d]
+            if not same.any():
+                break
+            a, b = order[:-d][same], order[d:][same]
+            found.append(np.minimum(a, b).astype(np.int64) * n + np.maximum(a, b))
+    if not found:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    packed = _sorted_unique(np.concatenate(found))
+    return packed // n, packed % n
+
+
+def _jaccard(sig, empty, ca, cb):
+    sim = (sig[ca] == sig[cb]).mean(axis=1)
+    return np.where(empty[ca] | empty[cb], 0.0, sim)
+
+
+def score_pairs(feat, a, b):
+    """Vectorized match score in [0, 1] for record pairs (a[i], b[i])."""
+    na, nb = feat.name_codes[a], feat.name_codes[b]
+    name = _jaccard(feat.name_sig, feat.name_empty, na, nb)
+    initials = (feat.last[na] == feat.last[nb]) & (feat.initial[na] == feat.initial[nb]) & (feat.abbreviated[na] | feat.abbreviated[nb])
+    name = np.where(initials, np.maximum(name, INITIALS_SIMILARITY), name)
+    company = _jaccard(feat.company_sig, feat.company_empty, feat.company_codes[a], feat.company_codes[b])
+    domain = (feat.domain[a] >= 0) & (feat.domain[a] == feat.domain[b])
+    score = WEIGHTS["name"] * name + WEIGHTS["company"] * company + WEIGHTS["domain"] * domain
+    # A shared address only settles it when the names agree too (role mailboxes like info@ are common).
+    same_email = (feat.email[a] >= 0) & (feat.email[a] == feat.email[b]) & (name >= 0.5)
+    return np.where(same_email, np.maximum(score, 0.99), score)
+
+
+_worker_features = None
+
+
+def _init_worker(feat):
+    global _worker_features
+    _worker_features = feat
+
+
+def _score_chunk(args):
+    a, b = args
+    return score_pairs(_worker_features, a, b)
+
+
+def _score_all(feat, a, b, workers):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(a) < POOL_MIN_PAIRS:
+        return score_pairs(feat, a, b)
+    chunks = [(a[i:i + CHUNK_PAIRS], b[i:i + CHUNK_PAIRS]) for i in range(0, len(a), CHUNK_PAIRS)]
+    # Spawned, not forked: the app calls this from a multithreaded server, and a forked child can
+    # inherit locks held by other threads.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(feat,)) as pool:
+        return np.concatenate(list(pool.map(_score_chunk, chunks)))
+
+
+def _components(n, a, b):
+    labels = np.arange(n)
+    while True:
+        m = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, a, m)
+        np.minimum.at(new, b, m)
+        new = new[new]
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def find_duplicates(std, threshold=MATCH_THRESHOLD, window=WINDOW, workers=None):
+    """Cluster likely duplicate prospects in `std`.
+
+    Returns ``(pairs, clusters, preview)``: scored matching pairs, one row per clustered record with its
+    cluster id and confidence, and one merged record per cluster.
+    """
+    feat = Features(std)
+    a, b = candidate_pairs(feat, window)
+    score = _score_all(feat, a, b, workers)
+    hit = score >= threshold
+    a, b, score = a[hit], b[hit], score[hit]
+    pairs = pd.DataFrame({"A": a, "B": b, "Score": score.round(3)})
+
+    if not len(a):
+        clusters = pd.DataFrame({"Row": a, "Cluster": a, "Confidence": score})
+        return pairs, clusters, merge_preview(std, clusters)
+
+    labels = _components(feat.n, a, b)
+    members = np.unique(np.concatenate([a, b]))
+    cluster = pd.factorize(labels[members], sort=True)[0]
+    edge_cluster = cluster[np.searchsorted(members, a)]
+    confidence = np.bincount(edge_cluster, weights=score) / np.bincount(edge_cluster)
+    clusters = pd.DataFrame({"Row": members, "Cluster": cluster, "Confidence": confidence[cluster].round(3)})
+    return pairs, clusters, merge_preview(std, clusters)
+
+
+def merge_preview(std, clusters):
+    """One row per cluster: the most complete value of each field across its members."""
+    cols = [c for c in PREVIEW_COLUMNS if c in std.columns]
+    if clusters.empty:
+        return pd.DataFrame(columns=["Cluster", "Size", "Confidence"] + cols + ["Members"])
+    recs = std.iloc[clusters["Row"].to_numpy()][cols].astype(object).replace("", np.nan)
+    recs.insert(0, "Cluster", clusters["Cluster"].to_numpy())
+    recs["_filled"] = recs[cols].notna().sum(axis=1)
+    recs = recs.sort_values(["Cluster", "_filled"], ascending=[True, False], kind="stable")
+    grouped = recs.groupby("Cluster", sort=True)
+    preview = grouped[cols].first().fillna("")
+    preview.insert(0, "Size", grouped.size())
+    preview.insert(1, "Confidence", clusters.groupby("Cluster")["Confidence"].first())
+    names = recs["Name"].fillna("").astype(str).to_numpy()
+    preview["Members"] = ["; ".join(m) for m in np.split(names, np.flatnonzero(np.diff(recs["Cluster"].to_numpy())) + 1)]
+    return preview.reset_index().sort_values(["Confidence", "Size"], ascending=False, ignore_index=True)
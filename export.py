@@ -0,0 +1,96 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+
+EXPORT_CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_575
+
+TEMPLATES = {
+    "Salesforce": {
+        "Name":"FullName","Role":"Title","Email":"Email","Phone":"Phone","Company":"AccountName","Country":"Country",
+        "Status":"LeadStatus","Priority":"Rating","Owner":"Owner","NextFollowUp":"NextFollowUp","PresentInCRM":"PresentInCRM","Notes":"Description",
+    },
+    "HubSpot": {
+        "Name":"firstname lastname","Role":"jobtitle","Email":"email","Phone":"phone","Company":"company","Country":"country",
+        "Status":"lifecyclestage","Priority":"hs_lead_rating","Owner":"hubspot_owner_id","NextFollowUp":"NextFollowUp","PresentInCRM":"present_in_crm","Notes":"notes",
+    },
+}
+
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def template_columns(df, template=None):
+    """(source column, exported column) pairs for `template`; every column unchanged when None."""
+    if template in (None, "None"):
+        return [(c, c) for c in df.columns]
+    return list(TEMPLATES[template].items())
+
+
+def _chunks(df, columns, chunk_rows):
+    src = [s for s, _ in columns]
+    out = [o for _, o in columns]
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows][src]
+        chunk.columns = out
+        yield chunk
+
+
+def to_csv(df, template=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    buf = io.BytesIO()
+    text = io.TextIOWrapper(buf, encoding="utf-8", newline="", write_through=True)
+    for i, chunk in enumerate(_chunks(df, template_columns(df, template), chunk_rows)):
+        chunk.to_csv(text, index=False, header=i == 0)
+    text.detach()
+    return buf.getvalue()
+
+
+def to_xlsx(df, template=None, chunk_rows=EXPORT_CHUNK_ROWS, sheet_name="Prospects"):
+    """Write the sheet row by row in xlsxwriter's constant_memory mode, one chunk of rows at a time."""
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS:,} rows; export {len(df):,} rows as CSV or Parquet.")
+    buf = io.BytesIO()
+    wb = xlsxwriter.Workbook(buf, {"constant_memory": True, "default_date_format": "yyyy-mm-dd hh:mm:ss"})
+    ws = wb.add_worksheet(sheet_name)
+    columns = template_columns(df, template)
+    ws.write_row(0, 0, [o for _, o in columns], wb.add_format({"bold": True}))
+    r = 1
+    for chunk in _chunks(df, columns, chunk_rows):
+        values = chunk.astype(object)
+        for row in values.where(chunk.notna(), None).itertuples(index=False, name=None):
+            ws.write_row(r, 0, row)
+            r += 1
+    wb.close()
+    return buf.getvalue()
+
+
+def to_parquet(df, template=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """One Parquet row group per chunk, all converted against the first chunk's schema."""
+    buf = io.BytesIO()
+    writer = None
+    for chunk in _chunks(df, template_columns(df, template), chunk_rows):
+        schema = writer.schema if writer is not None else None
+        table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(buf, table.schema)
+        writer.write_table(table)
+    writer.close()
+    return buf.getvalue()
+
+
+WRITERS = {"CSV": to_csv, "Excel": to_xlsx, "Parquet": to_parquet}
+
+
+def export_bytes(df, fmt, template=None):
+    return WRITERS[fmt](df, template)
+
+
+def contact_list(values, keep):
+    """Sorted, comma-joined distinct values of a column that pass `keep`."""
+    return ", ".join(sorted(v for v in pd.unique(values.dropna().astype(str)) if keep(v)))
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+INDEXED = ["Region", "Country", "Company", "Owner", "EmailDomain", "Status", "Priority", "PresentInCRM", "IsGenericDomain"]
+BITMAP_MAX_CARDINALITY = 512
+# Sidebar labels that stand for blank values.
+BLANK_LABELS = {"Owner": "(unassigned)", "Status": "(blank)", "Priority": "(blank)"}
+
+
+def sidebar_filters(selected, hide_generic=False, crm="All"):
+    """{column: accepted values} for `FilterIndex.select` (or the store) from the sidebar's choices.
+
+    `selected` maps columns to the chosen labels; blank labels map back to "".
+    """
+    filters = {col: [v if v != BLANK_LABELS.get(col) else "" for v in values] for col, values in selected.items()}
+    filters["IsGenericDomain"] = [False] if hide_generic else []
+    filters["PresentInCRM"] = [crm] if crm != "All" else []
+    return filters
+
+
+class FilterIndex:
+    """Row bitmaps per distinct value of the filterable std columns, built once per dataset.
+
+    Columns with at most `bitmap_max_cardinality` values keep one packed bitmap per value; wider
+    columns (Company, EmailDomain on big lists) keep sorted posting lists that are turned into a
+    bitmap on demand. Filters combine with bitwise OR within a column and AND across columns.
+    """
+
+    def __init__(self, std, columns=INDEXED, bitmap_max_cardinality=BITMAP_MAX_CARDINALITY):
+        self.std = std
+        self.n = len(std)
+        self._codes = {}
+        self._lookup = {}
+        self._postings = {}
+        self._bitmaps = {}
+        for col in columns:
+            s = std[col]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                codes, values = s.cat.codes.to_numpy(), s.cat.categories
+            else:
+                codes, values = pd.factorize(s)
+            codes = codes.astype(np.int32, copy=False)
+            self._codes[col] = codes
+            self._lookup[col] = {v: i for i, v in enumerate(values)}
+            order = np.argsort(codes, kind="stable").astype(np.int32, copy=False)
+            start = int((codes < 0).sum())
+            offsets = np.concatenate([[start], start + np.cumsum(np.bincount(codes[codes >= 0], minlength=len(values)))])
+            self._postings[col] = (order, offsets)
+            if len(values) <= bitmap_max_cardinality:
+                self._bitmaps[col] = [np.packbits(codes == i) for i in range(len(values))]
+
+    def all(self):
+        return np.packbits(np.ones(self.n, dtype=bool))
+
+    def any_of(self, col, values):
+        lookup = self._lookup[col]
+        codes = [lookup[v] for v in values if v in lookup]
+        if col in self._bitmaps:
+            bits = np.zeros((self.n + 7) // 8, dtype=np.uint8)
+            for i in codes:
+                np.bitwise_or(bits, self._bitmaps[col][i], out=bits)
+            return bits
+        order, offsets = self._postings[col]
+        mask = np.zeros(self.n, dtype=bool)
+        if codes:
+            mask[np.concatenate([order[offsets[i]:offsets[i + 1]] for i in codes])] = True
+        return np.packbits(mask)
+
+    def select(self, filters):
+        """AND together one OR-bitmap per column; `filters` maps column -> accepted values (empty = no filter)."""
+        bits = self.all()
+        for col, values in filters.items():
+            if values:
+                np.bitwise_and(bits, self.any_of(col, values), out=bits)
+        return bits
+
+    def rows(self, bits):
+        return np.flatnonzero(np.unpackbits(bits, count=self.n))
+
+    def take(self, rows, columns=None):
+        """Gather only `rows` of only `columns` (all columns when None) into a new frame."""
+        cols = self.std.columns if columns is None else columns
+        return pd.DataFrame({c: self.std[c].take(rows) for c in cols}, copy=False)
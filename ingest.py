@@ -0,0 +1,259 @@
+import csv
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.etree import ElementTree
+
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+
+CACHE_DIR = os.environ.get("PROSPECT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "prospect-explorer"))
+MEMORY_MAX_BYTES = int(os.environ.get("PROSPECT_CACHE_MEMORY_BYTES", 512 * 1024 ** 2))
+DISK_MAX_BYTES = int(os.environ.get("PROSPECT_CACHE_DISK_BYTES", 2 * 1024 ** 3))
+CSV_BLOCK_BYTES = 8 * 1024 ** 2
+OPEN_WORKBOOKS = 2
+# Bump when parsing changes what a cached frame holds (2: blanks are "" rather than "nan").
+CACHE_FORMAT = 2
+
+_workbooks = OrderedDict()
+_workbooks_lock = threading.Lock()
+
+
+def content_key(data, sheet=None):
+    h = hashlib.sha256(data)
+    h.update(b"\0sheet=" + str(sheet).encode("utf-8"))
+    return h.hexdigest()
+
+
+def strip_strings(df):
+    """Strip text columns in place; missing cells become "" like in the streamed CSV path."""
+    for c in df.columns:
+        if pd.api.types.is_object_dtype(df[c]) or pd.api.types.is_string_dtype(df[c]):
+            df[c] = df[c].astype(str).str.strip().where(df[c].notna(), "")
+    return df
+
+
+def excel_sheet_names(data):
+    """Sheet names from the workbook manifest (xl/workbook.xml), without parsing any worksheet."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as zf, zf.open("xl/workbook.xml") as fh:
+            return [el.get("name") for _, el in ElementTree.iterparse(fh) if el.tag.endswith("}sheet")]
+    except (zipfile.BadZipFile, KeyError):
+        wb = openpyxl.load_workbook(io.BytesIO(data), read_only=True)
+        try:
+            return wb.sheetnames
+        finally:
+            wb.close()
+
+
+def _header_names(header, width):
+    names, seen = [], {}
+    for i in range(width):
+        v = header[i] if i < len(header) else None
+        name = f"Unnamed: {i}" if v is None or str(v).strip() == "" else str(v)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _open_workbook(data, key=None):
+    # Loading parses the shared-strings table for the whole file; keep a few read-only workbooks
+    # open so reading another sheet of the same upload only streams that sheet's cells.
+    if key is None:
+        return openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    with _workbooks_lock:
+        wb = _workbooks.get(key)
+        if wb is not None:
+            _workbooks.move_to_end(key)
+            return wb
+    wb = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    with _workbooks_lock:
+        _workbooks[key] = wb
+        while len(_workbooks) > OPEN_WORKBOOKS:
+            _workbooks.popitem(last=False)[1].close()
+    return wb
+
+
+def read_excel_sheet(data, sheet=None, key=None):
+    """Stream one worksheet row by row in openpyxl read-only mode; the first row is the header.
+
+    Pass the upload's content `key` to reuse its open workbook across sheets.
+    """
+    wb = _open_workbook(data, key)
+    try:
+        ws = wb[sheet] if sheet is not None else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, ())
+        records = [r for r in rows if any(v is not None for v in r)]
+    finally:
+        if key is None:
+            wb.close()
+    width = max([len(header)] + [len(r) for r in records])
+    df = pd.DataFrame.from_records(records, columns=range(width)) if records else pd.DataFrame(columns=range(width))
+    df.columns = _header_names(header, width)
+    # Empty cells come back as None; match read_excel's NaN so they stringify the same way.
+    return df.infer_objects().mask(df.isna())
+
+
+def csv_header(data):
+    first = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", errors="replace", newline="")
+    return next(csv.reader(first), [])
+
+
+def read_csv_columns(data, columns, progress=None):
+    """Stream only `columns` of a CSV as strings with pyarrow, one block at a time.
+
+    `progress` is called with the fraction of input consumed after each block.
+    """
+    src = io.BytesIO(data)
+    reader = pacsv.open_csv(
+        src,
+        read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(columns),
+            column_types={c: pa.string() for c in columns},
+            strings_can_be_null=False,
+        ),
+    )
+    batches = []
+    for batch in reader:
+        batches.append(batch)
+        if progress is not None:
+            progress(min(src.tell() / max(len(data), 1), 1.0))
+    return pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+
+
+def read_upload(name, data, sheet=None, key=None):
+    if name.lower().endswith(".csv"):
+        # Every cell as text with blanks as "", exactly what read_csv_columns streams.
+        df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+    else:
+        df = read_excel_sheet(data, sheet, key)
+    return strip_strings(df)
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameCache:
+    """Parsed uploads keyed by content hash, held in memory (LRU) and on disk as Parquet.
+
+    Both tiers are bounded by total bytes; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, directory=CACHE_DIR, memory_max_bytes=MEMORY_MAX_BYTES, disk_max_bytes=DISK_MAX_BYTES):
+        self.directory = directory
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._mem = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.v{CACHE_FORMAT}.parquet")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        path = self._path(key)
+        if os.path.exists(path):
+            try:
+                df = pd.read_parquet(path)
+                os.utime(path)
+            except Exception:
+                df = None
+            if df is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, df)
+                return df
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, df):
+        self._remember(key, df)
+        self._persist(key, df)
+
+    def get_or_load(self, key, loader):
+        df = self.get(key)
+        if df is None:
+            df = loader()
+            self.put(key, df)
+        return df
+
+    def _remember(self, key, df):
+        size = frame_nbytes(df)
+        if size > self.memory_max_bytes:
+            return
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self._mem_bytes -= old[1]
+            self._mem[key] = (df, size)
+            self._mem_bytes += size
+            while self._mem_bytes > self.memory_max_bytes and len(self._mem) > 1:
+                _, (_, evicted) = self._mem.popitem(last=False)
+                self._mem_bytes -= evicted
+                self.evictions += 1
+
+    def _persist(self, key, df):
+        path = self._path(key)
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        except Exception:
+            # Parquet can't hold every frame (e.g. duplicate or mixed-type columns); memory tier still works.
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        try:
+            entries = [os.path.join(self.directory, n) for n in os.listdir(self.directory) if n.endswith(".parquet")]
+            files = sorted(((os.stat(p).st_mtime, os.stat(p).st_size, p) for p in entries))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, p in files:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(p)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._mem),
+                "memory_bytes": self._mem_bytes,
+            }
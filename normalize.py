@@ -0,0 +1,170 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from countries import display_names, region
+
+STD_COLUMNS = ["Name", "Email", "Phone", "Company", "Role", "Country", "Status", "Priority", "Owner", "LastContacted", "PresentInCRM", "Notes"]
+CATEGORICAL = ["Country", "Region", "Status", "Priority", "Owner", "EmailDomain", "PresentInCRM"]
+REQUIRED = ["Name", "Company", "Country"]
+
+# Raw header names tried in order (case-insensitive) when auto-mapping each std column.
+COLUMN_GUESSES = {
+    "Name": ["name","full name","contact","person"],
+    "Email": ["email","e-mail","mail","contact email"],
+    "Phone": ["phone","mobile","telephone","tel","phone number","cell"],
+    "Company": ["company","organisation","organization","employer"],
+    "Role": ["role","title","job title","position"],
+    "Country": ["country","nation","location","country name"],
+    "Status": ["status","stage","pipeline","funnel"],
+    "Priority": ["priority","tier","score"],
+    "Owner": ["owner","assignee","rep","account owner"],
+    "LastContacted": ["last_contacted","last contacted","lastcontacted","last touch","last reached"],
+    "PresentInCRM": ["present in crm","present","crm","in crm","crm_present","crm present"],
+    "Notes": ["notes","remarks","comment","description"],
+}
+
+GENERIC = {"gmail.com","yahoo.com","hotmail.com","outlook.com","icloud.com","proton.me","aol.com"}
+
+YES = {"1","true","yes","y","present","in crm","crm","✓","check","checked","x"}
+NO  = {"0","false","no","n","absent","not in crm","-",""}
+
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d", "%m/%d/%Y", "%d/%m/%Y", "%d.%m.%Y", "%d-%m-%Y", "%d %b %Y", "%b %d, %Y"]
+
+
+def guess_column(options, guesses):
+    """First of `options` whose lowercased name is one of `guesses` (in guess order), else None."""
+    lower = [str(o).lower() for o in options]
+    for g in guesses:
+        if g.lower() in lower:
+            return options[lower.index(g.lower())]
+    return None
+
+
+def guess_mapping(columns):
+    """{std column: raw column or None} using COLUMN_GUESSES."""
+    columns = list(columns)
+    return {name: guess_column(columns, COLUMN_GUESSES[name]) for name in STD_COLUMNS}
+
+
+def _factorize(s):
+    codes, uniques = pd.factorize(s, use_na_sentinel=False)
+    return codes, np.asarray(uniques, dtype=object)
+
+
+def _categorical(codes, values):
+    # Distinct raw values can collapse to the same cleaned value ("Acme" / "Acme "), so re-factorize.
+    vcodes, cats = pd.factorize(pd.Index(values, dtype=object), sort=True)
+    return pd.Categorical.from_codes(vcodes[codes], categories=cats)
+
+
+def _clean(value):
+    # Missing cells (NaN/None from read_csv or openpyxl) are blanks, not the string "nan".
+    return "" if pd.isna(value) else str(value).strip()
+
+
+def _crm(value):
+    v = value.lower()
+    return "Yes" if v in YES else ("No" if v in NO else "")
+
+
+def _domain(value):
+    at = value.find("@")
+    if at < 0:
+        return np.nan
+    rest = value[at + 1:]
+    end = len(rest)
+    for sep in ">,; \t\r\n":
+        i = rest.find(sep)
+        if i >= 0:
+            end = min(end, i)
+    return rest[:end].lower() if end else np.nan
+
+
+def detect_date_format(values, sample=200):
+    sample = [v for v in values if v][:sample]
+    if not sample:
+        return None
+    for fmt in DATE_FORMATS:
+        if pd.to_datetime(pd.Series(sample), format=fmt, errors="coerce").notna().all():
+            return fmt
+    return None
+
+
+def _parse_dates(codes, values):
+    fmt = detect_date_format(values)
+    if fmt is not None:
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), format=fmt, errors="coerce")
+    else:
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce", format="mixed")
+    return parsed.to_numpy()[codes], fmt
+
+
+def _object_bytes(codes, values):
+    # What memory_usage(deep=True) reports for the same column held as one Python object per row.
+    counts = np.bincount(codes, minlength=len(values))
+    sizes = np.array([sys.getsizeof(v) for v in values], dtype=np.int64)
+    return int(8 * len(codes) + (counts * sizes).sum())
+
+
+def build_std(df_raw, mapping):
+    """Build the standardized prospect frame from `df_raw` and a {std column: raw column or None} mapping.
+
+    Every string transform runs once per distinct value; low-cardinality columns are stored as
+    categoricals. Returns ``(std, report)`` where report compares memory against the object-dtype frame.
+    """
+    index = pd.RangeIndex(len(df_raw))
+    cols = {}
+    object_bytes = {}
+    for name in STD_COLUMNS:
+        src = mapping.get(name)
+        raw = df_raw[src].to_numpy() if src else np.full(len(df_raw), "", dtype=object)
+        codes, uniques = _factorize(raw)
+        values = np.array([_clean(u) for u in uniques], dtype=object)
+        if name == "Country":
+            values = np.array(display_names(values), dtype=object)
+        elif name == "PresentInCRM":
+            values = np.array([_crm(v) for v in values], dtype=object)
+        cols[name] = (codes, values)
+        object_bytes[name] = _object_bytes(codes, values)
+
+    std = pd.DataFrame(index=index)
+    for name in STD_COLUMNS:
+        codes, values = cols[name]
+        if name in CATEGORICAL:
+            std[name] = _categorical(codes, values)
+        else:
+            std[name] = values[codes]
+
+    country_codes = std["Country"].cat.codes.to_numpy()
+    countries = std["Country"].cat.categories.to_numpy(dtype=object)
+    regions = np.array([region(c) for c in countries], dtype=object)
+    std["Region"] = _categorical(country_codes, regions)
+    object_bytes["Region"] = _object_bytes(country_codes, regions)
+
+    email_codes, emails = cols["Email"]
+    domains = np.array([_domain(e) for e in emails], dtype=object)
+    std["EmailDomain"] = _categorical(email_codes, domains)
+    object_bytes["EmailDomain"] = _object_bytes(email_codes, domains)
+    std["IsGenericDomain"] = std["EmailDomain"].isin(GENERIC).to_numpy()
+
+    role_codes, roles = cols["Role"]
+    titled = np.array([r.title() for r in roles], dtype=object)
+    std["RoleNorm"] = titled[role_codes]
+
+    lc_codes, lc_values = cols["LastContacted"]
+    dates, date_format = _parse_dates(lc_codes, lc_values)
+    std["LastContacted_dt"] = dates
+
+    report = memory_report(std, object_bytes)
+    report.attrs["date_format"] = date_format
+    return std, report
+
+
+def memory_report(std, object_bytes):
+    rows = []
+    for name, before in object_bytes.items():
+        after = int(std[name].memory_usage(index=False, deep=True))
+        rows.append({"Column": name, "dtype": str(std[name].dtype), "ObjectBytes": before, "Bytes": after, "Saved": before - after})
+    return pd.DataFrame(rows)
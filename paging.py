@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SORT = ["Region", "Country", "Company", "Name"]
+PAGE_SIZES = [50, 100, 250, 500, 1000]
+
+
+def _sort_codes(values, descending=False):
+    """Codes that order like the values themselves (reversed when `descending`), missing values last."""
+    if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.is_monotonic_increasing:
+        codes, n = values.cat.codes.to_numpy().astype(np.int64), len(values.cat.categories)
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+        codes, n = codes.astype(np.int64), len(uniques)
+    if descending:
+        codes = np.where(codes >= 0, n - 1 - codes, codes)
+    codes[codes < 0] = n
+    return codes
+
+
+class SortKeys:
+    """Row ranks for sorting the std frame by any column, built once per column on first use.
+
+    Ties always fall back to the default Region → Country → Company → Name order, so sorting a
+    filtered view is a single integer argsort over the gathered ranks.
+    """
+
+    def __init__(self, std, default=DEFAULT_SORT):
+        self.std = std
+        self.n = len(std)
+        self._lock = threading.Lock()
+        order = np.lexsort([_sort_codes(std[c]) for c in reversed(default)])
+        self.default = self._ranks(order)
+        self._ranks_by_column = {}
+
+    def _ranks(self, order):
+        ranks = np.empty(self.n, dtype=np.int64)
+        ranks[order] = np.arange(self.n)
+        return ranks
+
+    def rank(self, column, descending=False):
+        key = (column, descending)
+        with self._lock:
+            ranks = self._ranks_by_column.get(key)
+        if ranks is None:
+            ranks = self._ranks(np.lexsort((self.default, _sort_codes(self.std[column], descending))))
+            with self._lock:
+                self._ranks_by_column[key] = ranks
+        return ranks
+
+    def order(self, rows, column=None, descending=False, values=None):
+        """Positions into `rows` in sorted order.
+
+        `values` (aligned with `rows`) sorts by a column computed for the view rather than a std column.
+        """
+        if values is not None:
+            return np.lexsort((self.default[rows], _sort_codes(pd.Series(values), descending)))
+        if column is None:
+            key = self.default[rows]
+            return np.argsort(-key if descending else key, kind="stable")
+        return np.argsort(self.rank(column, descending)[rows], kind="stable")
+
+
+def page_bounds(total, page, size):
+    """(start, stop, pages) for 1-based `page`, clamped to the last page."""
+    pages = max(1, -(-total // size))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * size
+    return start, min(start + size, total), pages
+
+
+def link_columns(page):
+    """mailto:/tel: markdown links for the Email and Phone cells of one page."""
+    page = page.copy()
+    if "Email" in page:
+        page["Email"] = page["Email"].map(lambda x: f"[{x}](mailto:{x})" if isinstance(x, str) and "@" in x else x)
+    if "Phone" in page:
+        page["Phone"] = page["Phone"].map(lambda x: f"[{x}](tel:{x})" if isinstance(x, str) and len(x.strip()) > 0 else x)
+    return page
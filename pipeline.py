@@ -0,0 +1,163 @@
+"""Normalize, score and export a directory of prospect spreadsheets without the UI.
+
+    python pipeline.py exports/ out/                                  # every .csv/.xlsx, one process per core
+    python pipeline.py exports/ out/ --template Salesforce --format Parquet --workers 4
+    python pipeline.py exports/ out/ --store ~/prospects.sqlite        # also merge every file into a local store
+
+Columns are auto-mapped with the same guesses as the app's sidebar; files missing a required
+column are skipped. Each input is exported to <output>/<name>.<ext>; inputs that share a name get
+"-2", "-3", … suffixes in input order. Per-file timings are written to <output>/pipeline_stats.csv.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from export import FORMATS, TEMPLATES, export_bytes
+from ingest import csv_header, read_csv_columns, read_upload
+from normalize import REQUIRED, build_std, guess_mapping
+from scoring import CADENCE, score_frame
+from store import ProspectStore
+from timing import StageTimer
+
+EXTENSIONS = (".csv", ".xlsx")
+STATS_FILE = "pipeline_stats.csv"
+
+
+def input_files(paths):
+    """Spreadsheets named in `paths`, expanding directories (non-recursively), in sorted order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += [os.path.join(path, n) for n in sorted(os.listdir(path)) if n.lower().endswith(EXTENSIONS)]
+        elif path.lower().endswith(EXTENSIONS):
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def output_paths(files, out_dir, fmt="CSV"):
+    """{input: output path}: the input's name with the format's extension, plus "-2", "-3", … when
+    inputs share a name ("east.csv" and "east.xlsx", or the same name in two directories)."""
+    used = set()
+    paths = {}
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, n = stem, 1
+        while name.lower() in used:
+            n += 1
+            name = f"{stem}-{n}"
+        used.add(name.lower())
+        paths[path] = os.path.join(out_dir, name + "." + FORMATS[fmt][0])
+    return paths
+
+
+def read_mapped(path, sheet=None):
+    """(raw frame, mapping) for one file; CSVs only read the columns the guesses map.
+
+    Both branches give text cells with blanks as "", the same as the app's upload path.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if path.lower().endswith(".csv"):
+        mapping = guess_mapping(csv_header(data))
+        mapped = [c for c in dict.fromkeys(mapping.values()) if c]
+        return (read_csv_columns(data, mapped) if mapped else pd.DataFrame()), mapping
+    df = read_upload(path, data, sheet)
+    return df, guess_mapping(df.columns)
+
+
+def process_file(path, out_dir, template=None, fmt="CSV", cadence=CADENCE, sheet=None, store=None, out=None):
+    """Run one file through read → normalize → (merge into `store`) → score → export and return its timing stats.
+
+    The export is written to `out`, by default `out_dir`/<input name>.<format extension>.
+    """
+    stats = {"file": os.path.basename(path), "status": "ok", "rows": 0, "output": "", "error": ""}
+    timer = StageTimer(file=stats["file"])
+    try:
+        df_raw, mapping = read_mapped(path, sheet)
+        timer.lap("read", len(df_raw))
+        missing = [c for c in REQUIRED if not mapping[c]]
+        if missing:
+            stats.update(status="skipped", error="unmapped required columns: " + ", ".join(missing))
+            return stats
+        std, _ = build_std(df_raw, mapping)
+        stats["rows"] = len(std)
+        timer.lap("normalize", len(std))
+        if store:
+            # Workers merge one at a time: SQLite serializes writers on the database lock.
+            ProspectStore(store).merge(std, mapping)
+            timer.lap("store", len(std))
+        scored = score_frame(std, cadence)
+        timer.lap("score", len(std))
+        data = export_bytes(scored, fmt, template)
+        out = out or output_paths([path], out_dir, fmt)[path]
+        with open(out, "wb") as fh:
+            fh.write(data)
+        stats["output"] = out
+        timer.lap("export", len(std))
+    except Exception as e:
+        stats.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        stats.update({f"{stage}_s": round(sec, 3) for stage, sec in timer.seconds().items()})
+        stats["total_s"] = round(sum(timer.seconds().values()), 3)
+    return stats
+
+
+def run(paths, out_dir, template=None, fmt="CSV", cadence=CADENCE, workers=None, sheet=None, progress=None, store=None):
+    """Process every file on a process pool; returns one stats row per file (input order) and
+    writes them to `out_dir`/pipeline_stats.csv. `progress` is called with each file's stats as it finishes."""
+    files = input_files(paths)
+    outputs = output_paths(files, out_dir, fmt)
+    os.makedirs(out_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, max(len(files), 1))
+    results = {}
+    if workers <= 1:
+        for path in files:
+            results[path] = process_file(path, out_dir, template, fmt, cadence, sheet, store, outputs[path])
+            if progress is not None:
+                progress(results[path])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_file, path, out_dir, template, fmt, cadence, sheet, store, outputs[path]): path for path in files}
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+                if progress is not None:
+                    progress(results[futures[fut]])
+    columns = ["file", "status", "rows", "read_s", "normalize_s", "store_s", "score_s", "export_s", "total_s", "output", "error"]
+    stats = pd.DataFrame([results[p] for p in files], columns=columns)
+    stats.to_csv(os.path.join(out_dir, STATS_FILE), index=False)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="input directories and/or .csv/.xlsx files; the last argument is the output directory")
+    parser.add_argument("--template", choices=["None"] + list(TEMPLATES), default="None", help="CRM column template")
+    parser.add_argument("--format", choices=list(FORMATS), default="CSV", dest="fmt")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--sheet", default=None, help="worksheet to read from .xlsx files (default: the first)")
+    parser.add_argument("--cadence", type=int, nargs=3, metavar=("HIGH", "MED", "LOW"), default=[CADENCE["high"], CADENCE["med"], CADENCE["low"]],
+                        help="follow-up cadence in days per priority")
+    parser.add_argument("--store", default=None, help="also merge every file into the local prospect store at this path")
+    args = parser.parse_args(argv)
+    if len(args.inputs) < 2:
+        parser.error("give at least one input and an output directory")
+    *inputs, out_dir = args.inputs
+    cadence = dict(zip(("high", "med", "low"), args.cadence))
+
+    def report(s):
+        print(f"{s['status']:<8}{s['file']:<40}{s['rows']:>10,} rows {s.get('total_s', 0):>8.2f} s  {s['error']}", file=sys.stderr)
+
+    start = time.perf_counter()
+    stats = run(inputs, out_dir, None if args.template == "None" else args.template, args.fmt, cadence, args.workers, args.sheet, report, args.store)
+    ok = stats["status"] == "ok"
+    print(f"{int(ok.sum())}/{len(stats)} files, {int(stats.loc[ok, 'rows'].sum()):,} rows in {time.perf_counter() - start:.2f} s; "
+          f"stats in {os.path.join(out_dir, STATS_FILE)}")
+    return 0 if ok.all() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+PRIORITY_POINTS = {"high": 3, "med": 2, "medium": 2, "low": 1}
+CEO_BONUS = 2
+NON_GENERIC_BONUS = 1
+RECENCY_DAYS = 60
+CADENCE = {"high": 14, "med": 30, "low": 45}
+CADENCE_LEVEL = {"high": "high", "med": "med", "medium": "med", "low": "low"}
+CADENCE_CACHE_SIZE = 8
+
+
+def _per_value(series, fn, dtype):
+    """Apply `fn` once per distinct value (categories or factorized strings) and broadcast to rows."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, values = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, values = pd.factorize(series)
+    out = np.array([fn(str(v)) for v in values] + [fn("")], dtype=dtype)
+    return out[codes]
+
+
+class ScoringEngine:
+    """Prospect Score and follow-up dates over a std frame.
+
+    The priority, CEO and domain points only depend on the data and the weights, so they are summed
+    once here; follow-up dates depend on the cadence sliders too and are cached per cadence. Recency,
+    DaysSinceContact and Overdue depend on the date, so they are computed against today for the
+    gathered rows only. Filtered views gather all of them with `columns(rows, cadence)`. Works on any
+    frame from ``normalize.build_std``, no UI needed.
+    """
+
+    def __init__(self, std, priority_points=PRIORITY_POINTS, ceo_bonus=CEO_BONUS, non_generic_bonus=NON_GENERIC_BONUS,
+                 recency_days=RECENCY_DAYS):
+        self.n = len(std)
+        self.last_contacted = std["LastContacted_dt"].to_numpy()
+        self.priority = _per_value(std["Priority"], lambda p: CADENCE_LEVEL.get(p.lower(), ""), object)
+
+        priority = _per_value(std["Priority"], lambda p: priority_points.get(p.lower(), 0), np.float64)
+        ceo = _per_value(std["Role"], lambda r: "ceo" in r.lower(), bool) * ceo_bonus
+        non_generic = (~std["IsGenericDomain"].to_numpy(dtype=bool)) * non_generic_bonus
+        self.points = priority + ceo + non_generic
+        self.recency_days = recency_days
+
+        self._follow_ups = OrderedDict()
+        self._lock = threading.Lock()
+
+    def follow_up(self, cadence=CADENCE):
+        """NextFollowUp for every row; unknown priorities use the low cadence."""
+        key = tuple(sorted(cadence.items()))
+        with self._lock:
+            cached = self._follow_ups.get(key)
+            if cached is not None:
+                self._follow_ups.move_to_end(key)
+                return cached
+        days = np.select([self.priority == level for level in ("high", "med")], [cadence["high"], cadence["med"]], cadence["low"])
+        next_follow_up = self.last_contacted + days.astype("timedelta64[D]")
+        with self._lock:
+            self._follow_ups[key] = next_follow_up
+            if len(self._follow_ups) > CADENCE_CACHE_SIZE:
+                self._follow_ups.popitem(last=False)
+        return next_follow_up
+
+    def columns(self, rows, cadence=CADENCE, today=None):
+        """DaysSinceContact, Score, NextFollowUp and Overdue (as of `today`, default today) for the row positions in `rows`."""
+        today = (pd.Timestamp.today() if today is None else pd.Timestamp(today)).normalize().to_datetime64()
+        days = np.floor((today - self.last_contacted[rows]) / np.timedelta64(1, "D"))
+        recency = np.clip(-np.where(np.isnan(days), self.recency_days, days) / self.recency_days, -1, 0)
+        next_follow_up = self.follow_up(cadence)[rows]
+        return {
+            "DaysSinceContact": days, "Score": (self.points[rows] + recency).round(2),
+            "NextFollowUp": next_follow_up, "Overdue": today > next_follow_up,
+        }
+
+
+def score_frame(std, cadence=CADENCE, **weights):
+    """`std` with DaysSinceContact, Score, NextFollowUp and Overdue columns added."""
+    return std.assign(**ScoringEngine(std, **weights).columns(np.arange(len(std)), cadence))
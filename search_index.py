@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ["Name", "Company", "Email", "Role"]
+FUZZY_THRESHOLD = 0.4
+SUBSTRING_SCORE = 0.9
+QUERY_CACHE_SIZE = 128
+
+# Each value is indexed as START + value so matches at the start of the value are grams too.
+START = "\x02"
+_BITS = 21
+_MASK = np.uint64((1 << _BITS) - 1)
+
+
+def _code_points(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _pack(cp):
+    cp = cp.astype(np.uint64)
+    return (cp[:-2] << np.uint64(2 * _BITS)) | (cp[1:-1] << np.uint64(_BITS)) | cp[2:]
+
+
+def trigram_keys(text):
+    cp = _code_points(text)
+    return np.unique(_pack(cp)) if len(cp) >= 3 else np.empty(0, dtype=np.uint64)
+
+
+def trigram_table(values):
+    """Packed trigram keys of every string in `values` with the position of the string owning each one.
+
+    Owners come out ascending; a string may own the same key more than once.
+    """
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    buf = _code_points("\0".join(values))
+    if len(buf) < 3:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    keys = _pack(buf)
+    valid = (buf[:-2] != 0) & (buf[1:-1] != 0) & (buf[2:] != 0)
+    owners = np.repeat(np.arange(len(values), dtype=np.int64), lengths + 1)[:len(keys)]
+    return keys[valid], owners[valid]
+
+
+class _FieldIndex:
+    def __init__(self, series):
+        codes, values = pd.factorize(series)
+        self.codes = codes
+        self.values = [str(v).lower() for v in values]
+        marked = [START + v for v in self.values]
+        keys, owners = trigram_table(marked)
+        # One stable sort groups equal grams with their owners already ascending; drop repeats in place.
+        order = np.argsort(keys, kind="stable")
+        keys, owners = keys[order], owners[order]
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+        keys, owners = keys[keep], owners[keep]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        self.gram_keys = keys[first]
+        self.postings = owners.astype(np.int32)
+        self.offsets = np.append(np.flatnonzero(first), len(keys))
+        self.parts = [(self.gram_keys >> np.uint64(s)) & _MASK for s in (2 * _BITS, _BITS, 0)]
+        self.short = [i for i, m in enumerate(marked) if len(m) < 3]
+
+    def _posting(self, gid):
+        return self.postings[self.offsets[gid]:self.offsets[gid + 1]]
+
+    def _lookup(self, key):
+        g = int(np.searchsorted(self.gram_keys, key))
+        if g < len(self.gram_keys) and self.gram_keys[g] == key:
+            return self._posting(g)
+        return self.postings[:0]
+
+    def _containing(self, pattern):
+        """Mask over distinct values containing `pattern` (1-3 chars), read straight off the gram table."""
+        cp = _code_points(pattern).astype(np.uint64)
+        p0, p1, p2 = self.parts
+        if len(cp) == 1:
+            hit = (p0 == cp[0]) | (p1 == cp[0]) | (p2 == cp[0])
+        elif len(cp) == 2:
+            hit = ((p0 == cp[0]) & (p1 == cp[1])) | ((p1 == cp[0]) & (p2 == cp[1]))
+        else:
+            hit = self.gram_keys == _pack(cp)[0]
+        mask = np.zeros(len(self.values), dtype=bool)
+        gids = np.flatnonzero(hit)
+        if len(gids):
+            mask[np.concatenate([self._posting(g) for g in gids])] = True
+        for i in self.short:
+            mask[i] = mask[i] or pattern in START + self.values[i]
+        return mask
+
+    def _candidates(self, text):
+        lists = sorted((self._lookup(k) for k in trigram_keys(text)), key=len)
+        out = lists[0]
+        for p in lists[1:]:
+            if not len(out):
+                break
+            out = np.intersect1d(out, p, assume_unique=True)
+        return out
+
+    def match(self, text, prefix=False):
+        """Score per distinct value: 1.0 where a word starts with `text`, SUBSTRING_SCORE for other substring hits."""
+        scores = np.zeros(len(self.values), dtype=np.float32)
+        if len(text) < 3:
+            sub = self._containing(text)
+            word = self._containing(START + text) | self._containing(" " + text)
+        else:
+            values = self.values
+            cand = [i for i in self._candidates(text).tolist() if text in values[i]]
+            sub = np.zeros(len(values), dtype=bool)
+            sub[cand] = True
+            word = np.zeros(len(values), dtype=bool)
+            word[[i for i in cand if values[i].startswith(text) or (" " + text) in values[i]]] = True
+        if not prefix:
+            scores[sub] = SUBSTRING_SCORE
+        scores[word] = 1.0
+        return scores
+
+    def similar(self, text, threshold=FUZZY_THRESHOLD):
+        """Share of the query's trigrams found in each distinct value (ranked below exact hits), zeroed below `threshold`."""
+        keys = trigram_keys(text)
+        scores = np.zeros(len(self.values), dtype=np.float32)
+        if not len(keys):
+            return scores
+        shared = np.bincount(np.concatenate([self._lookup(k) for k in keys]), minlength=len(self.values))
+        hit = np.flatnonzero(shared)
+        coverage = shared[hit] / len(keys)
+        scores[hit] = np.where(coverage >= threshold, coverage * SUBSTRING_SCORE * SUBSTRING_SCORE, 0)
+        return scores
+
+
+class SearchIndex:
+    """Trigram inverted index over the lowercased distinct values of the searchable std columns."""
+
+    def __init__(self, std, fields=SEARCH_FIELDS):
+        self._fields = {f: _FieldIndex(std[f]) for f in fields}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _value_scores(self, field, text, prefix, fuzzy):
+        key = (field, text, prefix, fuzzy)
+        with self._lock:
+            scores = self._cache.get(key)
+            if scores is not None:
+                self._cache.move_to_end(key)
+                return scores
+        index = self._fields[field]
+        scores = index.match(text, prefix=prefix)
+        if fuzzy:
+            scores = np.maximum(scores, index.similar(text))
+        with self._lock:
+            self._cache[key] = scores
+            if len(self._cache) > QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return scores
+
+    def search(self, rows, text, fields=("Name", "Company"), prefix=False, fuzzy=False):
+        """Best match score over `fields` for each row position in `rows` (0 = no match)."""
+        text = text.strip().lower()
+        best = np.zeros(len(rows), dtype=np.float32)
+        if not text:
+            best[:] = 1.0
+            return best
+        for field in fields:
+            index = self._fields[field]
+            scores = self._value_scores(field, text, prefix, fuzzy)
+            codes = index.codes[rows]
+            np.maximum(best, np.where(codes >= 0, scores[codes], 0), out=best)
+        return best
@@ -0,0 +1,249 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from normalize import CATEGORICAL, STD_COLUMNS
+from paging import DEFAULT_SORT
+from scoring import CADENCE, CADENCE_LEVEL
+
+STORE_PATH = os.environ.get("PROSPECT_STORE", os.path.join(os.path.expanduser("~"), ".cache", "prospect-explorer", "prospects.sqlite"))
+DERIVED = {"Region": "Country", "EmailDomain": "Email", "IsGenericDomain": "Email", "RoleNorm": "Role", "LastContacted_dt": "LastContacted"}
+COLUMNS = STD_COLUMNS + list(DERIVED)
+FILTERABLE = ["Region", "Country", "Company", "Owner", "EmailDomain", "Status", "Priority", "PresentInCRM", "IsGenericDomain"]
+FTS_MIN_CHARS = 3
+# Views up to this size are loaded into pandas for row-level tabs; larger ones stay in SQL.
+LOAD_MAX_ROWS = 250_000
+MERGE_BATCH_ROWS = 50_000
+CACHE_KIB = 256 * 1024
+# Concurrent merges (pipeline workers) wait for the write lock this long.
+BUSY_TIMEOUT_S = 600
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS prospects (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    nc_key TEXT NOT NULL,
+    {", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in STD_COLUMNS)},
+    Region TEXT NOT NULL DEFAULT '',
+    EmailDomain TEXT,
+    IsGenericDomain INTEGER NOT NULL DEFAULT 0,
+    RoleNorm TEXT NOT NULL DEFAULT '',
+    LastContacted_dt TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prospects_nc_key ON prospects (nc_key);
+CREATE INDEX IF NOT EXISTS prospects_default_order ON prospects ({", ".join(DEFAULT_SORT)}, id);
+{"".join(f"CREATE INDEX IF NOT EXISTS prospects_{c} ON prospects ({c});" for c in FILTERABLE)}
+CREATE VIRTUAL TABLE IF NOT EXISTS prospects_fts USING fts5(Name, Company, Role, content='prospects', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS prospects_ai AFTER INSERT ON prospects BEGIN
+    INSERT INTO prospects_fts (rowid, Name, Company, Role) VALUES (new.id, new.Name, new.Company, new.Role);
+END;
+CREATE TRIGGER IF NOT EXISTS prospects_au AFTER UPDATE OF Name, Company, Role ON prospects BEGIN
+    INSERT INTO prospects_fts (prospects_fts, rowid, Name, Company, Role) VALUES ('delete', old.id, old.Name, old.Company, old.Role);
+    INSERT INTO prospects_fts (rowid, Name, Company, Role) VALUES (new.id, new.Name, new.Company, new.Role);
+END;
+CREATE TRIGGER IF NOT EXISTS prospects_ad AFTER DELETE ON prospects BEGIN
+    INSERT INTO prospects_fts (prospects_fts, rowid, Name, Company, Role) VALUES ('delete', old.id, old.Name, old.Company, old.Role);
+END;
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('version', 0);
+"""
+
+
+def record_keys(std):
+    """(key, nc_key) per row: the lowercased email when it has an @, else "nc:" + name|company.
+
+    Rows with neither an email nor a name or company get key None: they can't be matched to a record.
+    """
+    nc = (std["Name"].astype(str).str.lower() + "|" + std["Company"].astype(str).str.lower()).to_numpy(dtype=object)
+    email = std["Email"].astype(str).str.strip().str.lower()
+    has_email = email.str.contains("@", regex=False).to_numpy(dtype=bool)
+    key = np.where(has_email, email.to_numpy(dtype=object), np.where(nc != "|", "nc:" + nc, None))
+    return key, nc
+
+
+def _check(column):
+    if column not in COLUMNS:
+        raise KeyError(f"not a stored column: {column}")
+
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+class ProspectStore:
+    """Normalized prospects in an on-disk SQLite database, merged upload by upload.
+
+    Records are keyed on email, falling back to name+company; a merge updates matching records
+    (non-blank incoming values win) and inserts the rest. Filters run on B-tree indexes, search on
+    an FTS5 trigram index, and aggregations as GROUP BY, so only results reach pandas.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+
+    def _connect(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+            self._local.con = con
+        return con
+
+    def version(self):
+        """Bumped by every merge; use it in cache keys."""
+        return self._connect().execute("SELECT value FROM meta WHERE name = 'version'").fetchone()[0]
+
+    def count(self, filters=None, query="", role=""):
+        where, params = self._where(filters, query, role)
+        return self._connect().execute(f"SELECT count(*) FROM prospects{where}", params).fetchone()[0]
+
+    def merge(self, std, mapping=None):
+        """Upsert a std frame (from ``normalize.build_std``); returns {"inserted": n, "updated": n, "skipped": n}.
+
+        `mapping` is the {std column: raw column or None} the frame was built with. Unmapped columns
+        never overwrite stored values; build_std fills them with defaults such as PresentInCRM "No".
+        Rows without an email, name or company are skipped.
+        """
+        key, nc = record_keys(std)
+        keyed = pd.notna(key)
+        data = {c: std[c].astype(object).where(std[c].notna(), None) for c in STD_COLUMNS + ["Region", "EmailDomain", "RoleNorm"]}
+        data["IsGenericDomain"] = std["IsGenericDomain"].astype(int)
+        data["LastContacted_dt"] = std["LastContacted_dt"].dt.strftime("%Y-%m-%d %H:%M:%S").astype(object).where(std["LastContacted_dt"].notna(), None)
+        incoming = pd.DataFrame({"key": key, "nc_key": nc, **{c: data[c] for c in COLUMNS}})[keyed]
+        cols = ", ".join(COLUMNS)
+        unmapped = set() if mapping is None else {c for c in STD_COLUMNS if not mapping.get(c)}
+        keep = ", ".join(
+            f"{c} = prospects.{c}" if DERIVED.get(c, c) in unmapped else
+            f"{c} = CASE WHEN excluded.{DERIVED.get(c, c)} != '' THEN excluded.{c} ELSE prospects.{c} END" for c in COLUMNS
+        )
+        con = self._connect()
+        with con:
+            # Take the write lock up front; upgrading a read transaction fails at once when another merge holds it.
+            con.execute("BEGIN IMMEDIATE")
+            before = self.count()
+            con.execute(f"CREATE TEMP TABLE IF NOT EXISTS incoming (key TEXT, nc_key TEXT, {cols})")
+            con.execute("DELETE FROM incoming")
+            insert = f"INSERT INTO incoming VALUES ({', '.join('?' * (len(COLUMNS) + 2))})"
+            for start in range(0, len(incoming), MERGE_BATCH_ROWS):
+                con.executemany(insert, incoming.iloc[start:start + MERGE_BATCH_ROWS].itertuples(index=False, name=None))
+            con.execute("CREATE INDEX IF NOT EXISTS temp.incoming_nc_key ON incoming (nc_key)")
+            # Rows without an email join the record that already has their name+company.
+            con.execute("""
+                UPDATE incoming SET key = (SELECT p.key FROM prospects p WHERE p.nc_key = incoming.nc_key ORDER BY p.id LIMIT 1)
+                WHERE key LIKE 'nc:%' AND nc_key IN (SELECT nc_key FROM prospects)
+            """)
+            # Stored rows without an email take the email of an incoming row with their name+company.
+            con.execute("""
+                UPDATE prospects SET key = (
+                    SELECT i.key FROM incoming i
+                    WHERE i.nc_key = prospects.nc_key AND i.key NOT LIKE 'nc:%' AND i.key NOT IN (SELECT key FROM prospects)
+                    ORDER BY i.rowid DESC LIMIT 1)
+                WHERE key LIKE 'nc:%' AND nc_key IN (
+                    SELECT nc_key FROM incoming WHERE key NOT LIKE 'nc:%' AND key NOT IN (SELECT key FROM prospects))
+            """)
+            con.execute("DELETE FROM incoming WHERE rowid NOT IN (SELECT max(rowid) FROM incoming GROUP BY key)")
+            con.execute(f"""
+                INSERT INTO prospects (key, nc_key, {cols}, updated_at)
+                SELECT key, nc_key, {cols}, ? FROM incoming WHERE true
+                ON CONFLICT (key) DO UPDATE SET {keep},
+                    nc_key = CASE WHEN excluded.Name != '' AND excluded.Company != '' THEN excluded.nc_key ELSE prospects.nc_key END,
+                    updated_at = excluded.updated_at
+            """, (time.time(),))
+            merged = con.execute("SELECT count(*) FROM incoming").fetchone()[0]
+            con.execute("DELETE FROM incoming")
+            con.execute("UPDATE meta SET value = value + 1 WHERE name = 'version'")
+            inserted = self.count() - before
+        return {"inserted": inserted, "updated": merged - inserted, "skipped": int((~keyed).sum())}
+
+    def _where(self, filters=None, query="", role=""):
+        clauses, params = [], []
+        for col, values in (filters or {}).items():
+            if col not in FILTERABLE:
+                raise KeyError(f"not a filterable column: {col}")
+            if values:
+                values = [int(v) if col == "IsGenericDomain" else v for v in values]
+                clauses.append(f"{col} IN ({', '.join('?' * len(values))})")
+                params += values
+        for text, fields in ((query, ["Name", "Company"]), (role, ["Role"])):
+            text = text.strip().lower()
+            if not text:
+                continue
+            if len(text) >= FTS_MIN_CHARS:
+                clauses.append("id IN (SELECT rowid FROM prospects_fts WHERE prospects_fts MATCH ?)")
+                params.append("{" + " ".join(fields) + "} : " + _fts_phrase(text))
+            else:
+                clauses.append("(" + " OR ".join(f"instr(lower({f}), ?) > 0" for f in fields) + ")")
+                params += [text] * len(fields)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def distinct(self, column):
+        """Sorted distinct values of an indexed column (read from the index)."""
+        _check(column)
+        rows = self._connect().execute(f"SELECT DISTINCT {column} FROM prospects ORDER BY {column}").fetchall()
+        return [r[0] for r in rows if r[0] is not None]
+
+    def counts(self, dims, filters=None, query="", role=""):
+        """Prospects per combination of `dims` over the matching records."""
+        for d in dims:
+            _check(d)
+        where, params = self._where(filters, query, role)
+        sql = f"SELECT {', '.join(dims)}, count(*) AS Prospects FROM prospects{where} GROUP BY {', '.join(dims)}"
+        df = pd.read_sql_query(sql, self._connect(), params=params)
+        for d in dims:
+            df[d] = pd.Categorical(df[d])
+        return df
+
+    def kpis(self, filters=None, query="", role="", cadence=CADENCE, today=None):
+        """The header metrics over the matching records, computed like the app computes them on a view.
+
+        Overdue is counted as of `today` (default: today).
+        """
+        where, params = self._where(filters, query, role)
+        levels = list(CADENCE_LEVEL.items())
+        days = "CASE lower(Priority) " + " ".join(f"WHEN '{p}' THEN ?" for p, _ in levels) + " ELSE ? END"
+        today = (pd.Timestamp.today() if today is None else pd.Timestamp(today)).normalize().strftime("%Y-%m-%d %H:%M:%S")
+        row = self._connect().execute(f"""
+            SELECT count(*), count(DISTINCT Country), count(DISTINCT Company), sum(Role LIKE '%ceo%'), count(DISTINCT EmailDomain),
+                   sum(LastContacted_dt IS NOT NULL AND julianday(?) > julianday(LastContacted_dt) + {days})
+            FROM prospects{where}
+        """, [today] + [cadence[level] for _, level in levels] + [cadence["low"]] + params).fetchone()
+        return dict(zip(["Prospects", "Countries", "Companies", "CEOs", "Domains", "Overdue"], [v or 0 for v in row]))
+
+    def page(self, filters=None, query="", role="", column=None, descending=False, offset=0, limit=100):
+        """`limit` matching records from `offset` as a std frame, in ``paging.SortKeys`` order:
+        the default Region → Country → Company → Name order, or `column` with ties in default order."""
+        where, params = self._where(filters, query, role)
+        direction = "DESC" if descending else "ASC"
+        if column is None:
+            order = [f"{c} {direction}" for c in DEFAULT_SORT + ["id"]]
+        else:
+            _check(column)
+            order = [f"{column} IS NULL", f"{column} {direction}"] + DEFAULT_SORT + ["id"]
+        sql = f"SELECT {', '.join(COLUMNS)} FROM prospects{where} ORDER BY {', '.join(order)} LIMIT ? OFFSET ?"
+        return self._frame(pd.read_sql_query(sql, self._connect(), params=params + [limit, offset]))
+
+    def load(self, filters=None, query="", role=""):
+        """Matching records as a std frame (same columns and dtypes as ``build_std``)."""
+        where, params = self._where(filters, query, role)
+        return self._frame(pd.read_sql_query(f"SELECT {', '.join(COLUMNS)} FROM prospects{where} ORDER BY id", self._connect(), params=params))
+
+    def _frame(self, df):
+        std = pd.DataFrame(index=pd.RangeIndex(len(df)))
+        for c in STD_COLUMNS + ["Region", "EmailDomain"]:
+            std[c] = pd.Categorical(df[c]) if c in CATEGORICAL else df[c].to_numpy(dtype=object)
+        std["IsGenericDomain"] = df["IsGenericDomain"].to_numpy(dtype=bool)
+        std["RoleNorm"] = df["RoleNorm"].to_numpy(dtype=object)
+        std["LastContacted_dt"] = pd.to_datetime(df["LastContacted_dt"], format="%Y-%m-%d %H:%M:%S")
+        return std
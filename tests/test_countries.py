@@ -0,0 +1,19 @@
+import pandas as pd
+
+from countries import display_names, resolve, unresolved
+from normalize import build_std, guess_mapping
+
+
+def test_placeholders_are_blank_not_namibia():
+    values = ["NA", "N/A", "n.a.", "Unknown", "none", "-", "Namibia", "NAM", "Germany"]
+    assert [resolve(v) for v in values] == [None] * 6 + ["NAM", "NAM", "DEU"]
+    assert display_names(values) == [""] * 6 + ["Namibia", "Namibia", "Germany"]
+
+
+def test_placeholder_countries_count_as_missing():
+    raw = pd.DataFrame({"Name": ["A", "B", "C", "D"], "Country": ["NA", "N/A", "Namibia", "Narnia"]})
+    std, _ = build_std(raw, guess_mapping(raw.columns))
+
+    assert std["Country"].tolist() == ["", "", "Namibia", "Narnia"]
+    assert std["Region"].tolist() == ["Other", "Other", "EMEA", "Other"]
+    assert unresolved(std["Country"].unique()) == ["Narnia"]
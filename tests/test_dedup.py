@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+import dedup
+from benchmarks.synthetic import prospects
+from dedup import Features, _components, candidate_pairs, find_duplicates, score_pairs
+from normalize import build_std, guess_mapping
+
+
+def _std(rows):
+    raw = pd.DataFrame(rows, columns=["Name", "Email", "Phone", "Company", "Country", "Role", "Owner"])
+    return build_std(raw, guess_mapping(raw.columns))[0]
+
+
+def _clustered(clusters, *rows):
+    cluster = dict(zip(clusters["Row"], clusters["Cluster"]))
+    return all(r in cluster for r in rows) and len({cluster[r] for r in rows}) == 1
+
+
+def test_legal_suffixes_case_and_initials_cluster():
+    std = _std([
+        ["John Smith", "john@acme.de", "", "Acme GmbH", "Germany", "CEO", "Ana"],
+        ["J. Smith", "", "+49 30 1234", "ACME", "Germany", "", ""],
+        ["Priya Shah", "priya@volt.in", "", "Volt Ltd", "India", "CTO", ""],
+    ])
+    pairs, clusters, preview = find_duplicates(std)
+
+    assert pairs[["A", "B"]].values.tolist() == [[0, 1]]
+    assert _clustered(clusters, 0, 1) and 2 not in set(clusters["Row"])
+    # The fullest record leads; gaps are filled from the other members.
+    assert preview.loc[0, ["Size", "Name", "Email", "Phone", "Company", "Role", "Owner"]].tolist() == [
+        2, "John Smith", "john@acme.de", "+49 30 1234", "Acme GmbH", "CEO", "Ana"]
+    assert preview.loc[0, "Members"] == "John Smith; J. Smith"
+
+
+def test_shared_role_mailbox_does_not_match_different_names():
+    std = _std([
+        ["Anna Rossi", "info@volt.it", "", "Volt Srl", "Italy", "", ""],
+        ["Marco Bianchi", "info@volt.it", "", "Volt Srl", "Italy", "", ""],
+        ["Anna Rossi", "info@volt.it", "", "Volt", "Italy", "", ""],
+    ])
+    feat = Features(std)
+    a, b = candidate_pairs(feat)
+    assert {(0, 1), (0, 2), (1, 2)} <= set(zip(a.tolist(), b.tolist()))
+    scores = dict(zip(zip(a.tolist(), b.tolist()), score_pairs(feat, a, b)))
+    assert scores[(0, 2)] >= 0.99
+    assert scores[(0, 1)] < dedup.MATCH_THRESHOLD and scores[(1, 2)] < dedup.MATCH_THRESHOLD
+
+
+def test_each_blocking_pass_finds_its_pairs():
+    std = _std([
+        ["Kenji Sato", "", "", "Grid Power KK", "Japan", "", ""],        # company token "grid" ...
+        ["Kenji Satou", "", "", "Grid Motion", "Japan", "", ""],         # ... shared with row 0
+        ["Olga Ivanova", "olga@drive.ru", "", "Drive", "Russia", "", ""],  # company domain "drive.ru" ...
+        ["Olga Ivanov", "o.i@drive.ru", "", "Blue", "Russia", "", ""],     # ... shared with row 2
+        ["Li Wang", "liwang@gmail.com", "", "Eco", "China", "", ""],       # webmail never blocks ...
+        ["Chen Wang", "chen@gmail.com", "", "Future", "China", "", ""],    # ... but surname + initial
+        ["Chen Wang", "", "", "Solar", "China", "", ""],                 # "wang c" blocks rows 5 and 6
+    ])
+    a, b = candidate_pairs(Features(std))
+    pairs = set(zip(a.tolist(), b.tolist()))
+    assert {(0, 1), (2, 3), (5, 6)} <= pairs
+    assert (4, 5) not in pairs
+
+
+def test_components_follow_chains_in_any_order():
+    a = np.array([4, 3, 2, 1, 7])
+    b = np.array([5, 4, 3, 2, 6])
+    assert _components(9, a, b).tolist() == [0, 1, 1, 1, 1, 1, 6, 6, 8]
+
+
+def test_pool_scores_match_serial(monkeypatch):
+    raw = prospects(3000, seed=11, companies=300)
+    feat = Features(build_std(raw, guess_mapping(raw.columns))[0])
+    a, b = candidate_pairs(feat)
+    monkeypatch.setattr(dedup, "POOL_MIN_PAIRS", 0)
+    monkeypatch.setattr(dedup, "CHUNK_PAIRS", len(a) // 3 + 1)
+    np.testing.assert_array_equal(dedup._score_all(feat, a, b, workers=2), score_pairs(feat, a, b))
@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import export
+from export import TEMPLATES, to_csv, to_parquet, to_xlsx
+
+
+def _frame(rows=23):
+    return pd.DataFrame({
+        "Name": [f"Person {i}" for i in range(rows)],
+        "Email": [f"p{i}@acme.com" if i % 4 else "" for i in range(rows)],
+        "Country": pd.Categorical(["Italy", "Japan", "Italy"] * (rows // 3) + ["Italy"] * (rows % 3)),
+        "Score": np.linspace(0, 5, rows).round(2),
+        "NextFollowUp": pd.to_datetime(["2025-01-02", None] * (rows // 2) + ["2025-03-04"] * (rows % 2)),
+        # Only the first chunk has text; later chunks must still convert against its schema.
+        "Notes": ["call back" if i < 3 else None for i in range(rows)],
+    })
+
+
+def test_chunked_csv_matches_a_single_write():
+    df = _frame()
+    assert to_csv(df, chunk_rows=5) == df.to_csv(index=False).encode("utf-8")
+    crm = pd.DataFrame({c: [f"{c} {i}" for i in range(7)] for c in TEMPLATES["Salesforce"]})
+    out = pd.read_csv(io.BytesIO(to_csv(crm, "Salesforce", chunk_rows=3)))
+    assert list(out.columns) == list(TEMPLATES["Salesforce"].values())
+    assert out["FullName"].tolist() == crm["Name"].tolist()
+    assert to_csv(df.iloc[:0]) == b"Name,Email,Country,Score,NextFollowUp,Notes\n"
+
+
+def test_parquet_reuses_the_first_chunk_schema():
+    df = _frame()
+    data = to_parquet(df, chunk_rows=5)
+    meta = pq.ParquetFile(io.BytesIO(data)).metadata
+    assert meta.num_row_groups == 5 and meta.num_rows == len(df)
+    pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(data)), df, check_dtype=False)
+    assert len(pd.read_parquet(io.BytesIO(to_parquet(df.iloc[:0])))) == 0
+
+
+def test_xlsx_round_trip_and_row_limit(monkeypatch):
+    df = _frame()
+    ws = openpyxl.load_workbook(io.BytesIO(to_xlsx(df, chunk_rows=5))).active
+    rows = list(ws.values)
+    assert rows[0] == tuple(df.columns)
+    assert len(rows) == len(df) + 1
+    assert rows[2][:4] == ("Person 1", "p1@acme.com", "Japan", df["Score"][1])
+    assert rows[1][4].date() == pd.Timestamp("2025-01-02").date() and rows[2][4] is None
+    assert rows[5][5] is None
+
+    monkeypatch.setattr(export, "EXCEL_MAX_ROWS", len(df) - 1)
+    with pytest.raises(ValueError, match="at most"):
+        to_xlsx(df)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from benchmarks.synthetic import prospects
+from filter_index import BLANK_LABELS, FilterIndex, sidebar_filters
+from normalize import build_std, guess_mapping
+
+
+def _baseline(std, selected, hide_generic, crm):
+    # The boolean-mask chain the app ran before the index.
+    f = std
+    for col in ["Region", "Country", "Company", "Owner", "EmailDomain", "Status", "Priority"]:
+        if selected.get(col):
+            f = f[f[col].isin([v if v != BLANK_LABELS.get(col) else "" for v in selected[col]])]
+    if hide_generic:
+        f = f[~f["IsGenericDomain"]]
+    if crm != "All":
+        f = f[f["PresentInCRM"] == crm]
+    return f.index.to_numpy()
+
+
+def _labels(std, col):
+    return [v if v else BLANK_LABELS.get(col, v) for v in std[col].astype(str).unique()]
+
+
+def test_select_matches_the_mask_chain():
+    raw = prospects(5000, seed=9, companies=400)
+    std, _ = build_std(raw, guess_mapping(raw.columns))
+    # Company and EmailDomain fall back to posting lists in the narrow index.
+    indexes = [FilterIndex(std), FilterIndex(std, bitmap_max_cardinality=16)]
+    rng = np.random.default_rng(9)
+    columns = ["Region", "Country", "Company", "Owner", "EmailDomain", "Status", "Priority"]
+    for _ in range(200):
+        selected = {}
+        for col in rng.choice(columns, rng.integers(0, 4), replace=False):
+            labels = _labels(std, col)
+            selected[col] = list(rng.choice(labels, min(len(labels), rng.integers(1, 4)), replace=False))
+        hide_generic = bool(rng.integers(2))
+        crm = str(rng.choice(["All", "Yes", "No"]))
+        expected = _baseline(std, selected, hide_generic, crm)
+        for fidx in indexes:
+            rows = fidx.rows(fidx.select(sidebar_filters(selected, hide_generic, crm)))
+            np.testing.assert_array_equal(rows, expected, err_msg=repr((selected, hide_generic, crm)))
+
+
+def test_blank_labels_and_generic_domains():
+    raw = prospects(3000, seed=2)
+    std, _ = build_std(raw, guess_mapping(raw.columns))
+    fidx = FilterIndex(std)
+    filters = sidebar_filters({"Owner": ["(unassigned)"], "Status": ["(blank)", "New"], "Priority": ["(blank)"]})
+    assert filters["Owner"] == [""] and filters["Status"] == ["", "New"] and filters["Priority"] == [""]
+
+    rows = fidx.rows(fidx.select(filters))
+    assert len(rows) > 0
+    assert (std["Owner"].iloc[rows] == "").all() and std["Status"].iloc[rows].isin(["", "New"]).all()
+
+    generic = fidx.rows(fidx.select(sidebar_filters({}, hide_generic=True)))
+    np.testing.assert_array_equal(generic, np.flatnonzero(~std["IsGenericDomain"].to_numpy()))
+    assert std["IsGenericDomain"].any()
+    # Unknown values match nothing; no selection matches everything.
+    assert len(fidx.rows(fidx.select({"Country": ["Atlantis"]}))) == 0
+    assert len(fidx.rows(fidx.select(sidebar_filters({"Country": []})))) == len(std)
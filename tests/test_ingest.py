@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+
+from benchmarks.synthetic import prospects
+from ingest import CACHE_FORMAT, FrameCache, csv_header, frame_nbytes, read_csv_columns, read_upload
+from normalize import build_std, guess_mapping
+
+
+def test_full_and_streamed_csv_build_the_same_std():
+    raw = prospects(3000, seed=3)
+    raw.loc[::7, "Notes"] = "  padded  "
+    raw.loc[::11, "Country"] = "NA"
+    data = raw.to_csv(index=False).encode("utf-8")
+    mapping = guess_mapping(csv_header(data))
+    mapped = [c for c in dict.fromkeys(mapping.values()) if c]
+
+    full, full_report = build_std(read_upload("prospects.csv", data), mapping)
+    streamed, streamed_report = build_std(read_csv_columns(data, mapped), mapping)
+
+    pd.testing.assert_frame_equal(full, streamed)
+    assert full_report.attrs == streamed_report.attrs
+
+
+def _frame(seed, rows=200):
+    return pd.DataFrame({"Name": [f"p{seed}-{i}" for i in range(rows)], "Company": [f"c{i % 7}" for i in range(rows)]})
+
+
+def test_frame_cache_memory_lru_and_counters(tmp_path):
+    frames = {k: _frame(i) for i, k in enumerate("abc")}
+    size = frame_nbytes(frames["a"])
+    cache = FrameCache(str(tmp_path), memory_max_bytes=2 * size + size // 2)
+    cache.put("a", frames["a"])
+    cache.put("b", frames["b"])
+    assert cache.get("a") is frames["a"]
+    cache.put("c", frames["c"])  # evicts b, the least recently used
+    assert list(cache._mem) == ["a", "c"]
+
+    # b comes back from disk and pushes a out in turn.
+    pd.testing.assert_frame_equal(cache.get("b"), frames["b"])
+    assert list(cache._mem) == ["c", "b"]
+    assert cache.get("missing") is None
+    assert cache.stats() == {"hits": 1, "disk_hits": 1, "misses": 1, "evictions": 2, "entries": 2,
+                             "memory_bytes": frame_nbytes(frames["c"]) + frame_nbytes(cache._mem["b"][0])}
+
+
+def test_frame_cache_keeps_oversized_frames_on_disk_only(tmp_path):
+    df = _frame(0)
+    cache = FrameCache(str(tmp_path), memory_max_bytes=frame_nbytes(df) - 1)
+    loads = []
+    assert cache.get_or_load("k", lambda: loads.append(1) or df) is df
+    assert cache.stats()["entries"] == 0
+    pd.testing.assert_frame_equal(cache.get_or_load("k", lambda: loads.append(1) or df), df)
+    assert loads == [1] and cache.stats()["disk_hits"] == 1
+    assert os.listdir(tmp_path) == [f"k.v{CACHE_FORMAT}.parquet"]
+
+
+def test_frame_cache_evicts_the_oldest_files_past_the_disk_bound(tmp_path):
+    cache = FrameCache(str(tmp_path), memory_max_bytes=0)
+    cache.put("a", _frame(0))
+    size = os.path.getsize(cache._path("a"))
+    cache.disk_max_bytes = 2 * size + size // 2
+    cache.put("b", _frame(1))
+    os.utime(cache._path("a"), (1, 1))
+    os.utime(cache._path("b"), (2, 2))
+    assert cache.get("a") is not None  # a disk hit refreshes a's mtime, so b is now the oldest
+    cache.put("c", _frame(2))
+
+    assert sorted(os.listdir(tmp_path)) == [f"{k}.v{CACHE_FORMAT}.parquet" for k in ("a", "c")]
+    assert cache.stats()["evictions"] == 1
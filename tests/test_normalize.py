@@ -0,0 +1,35 @@
+import io
+
+import pandas as pd
+
+from benchmarks.synthetic import prospects
+from normalize import build_std, guess_mapping
+
+
+def _mapping(raw):
+    return {**guess_mapping(raw.columns), "LastContacted": "LastContacted"}
+
+
+def _read_with_blanks(raw):
+    # Round-trip through read_csv so blank cells come back as NaN, as they do from an upload.
+    return pd.read_csv(io.StringIO(raw.to_csv(index=False)))
+
+
+def test_day_first_dates_with_blanks():
+    raw = prospects(5000, seed=3, date_style="%d/%m/%Y")
+    std, report = build_std(_read_with_blanks(raw), _mapping(raw))
+
+    assert report.attrs["date_format"] == "%d/%m/%Y"
+    expected = pd.to_datetime(raw["LastContacted"], format="%d/%m/%Y", errors="coerce")
+    pd.testing.assert_series_equal(std["LastContacted_dt"], expected, check_names=False)
+
+
+def test_missing_cells_are_blank():
+    raw = prospects(2000, seed=3)
+    std, _ = build_std(_read_with_blanks(raw), _mapping(raw))
+
+    for column in ["Owner", "Status", "Priority", "Country"]:
+        assert "nan" not in std[column].cat.categories
+        assert (std[column] == "").sum() == (raw[column] == "").sum()
+    # Blank CRM cells count as "not in CRM", like the explicit "No" values.
+    assert (std["PresentInCRM"] == "").sum() == 0
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from benchmarks.synthetic import prospects
+from normalize import build_std
+from pipeline import read_mapped, run
+
+
+def test_csv_and_xlsx_inputs_build_the_same_std(tmp_path):
+    raw = prospects(500, seed=3)
+    raw.to_csv(tmp_path / "a.csv", index=False)
+    raw.to_excel(tmp_path / "b.xlsx", index=False)
+
+    from_csv, csv_mapping = read_mapped(str(tmp_path / "a.csv"))
+    from_xlsx, xlsx_mapping = read_mapped(str(tmp_path / "b.xlsx"))
+    assert csv_mapping == xlsx_mapping
+    assert csv_mapping["LastContacted"] == "LastContacted"
+
+    csv_std, _ = build_std(from_csv, csv_mapping)
+    xlsx_std, _ = build_std(from_xlsx, xlsx_mapping)
+    pd.testing.assert_frame_equal(csv_std, xlsx_std)
+    assert (csv_std["Owner"] == "").sum() == (raw["Owner"] == "").sum()
+
+
+def test_inputs_sharing_a_name_get_their_own_output(tmp_path):
+    (tmp_path / "west").mkdir()
+    prospects(30, seed=1).to_csv(tmp_path / "east.csv", index=False)
+    prospects(40, seed=2).to_excel(tmp_path / "east.xlsx", index=False)
+    prospects(50, seed=3).to_csv(tmp_path / "west" / "east.csv", index=False)
+
+    stats = run([str(tmp_path), str(tmp_path / "west")], str(tmp_path / "out"), workers=1)
+    assert stats["status"].tolist() == ["ok"] * 3
+    assert [p.rsplit("/", 1)[-1] for p in stats["output"]] == ["east.csv", "east-2.csv", "east-3.csv"]
+    assert [len(pd.read_csv(p)) for p in stats["output"]] == [30, 40, 50]
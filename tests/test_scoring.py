@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import prospects
+from normalize import build_std, guess_mapping
+from scoring import CADENCE, ScoringEngine
+
+
+def _std():
+    raw = prospects(2000, seed=7)
+    return build_std(raw, guess_mapping(raw.columns))[0]
+
+
+def test_overdue_follows_the_date_for_a_cached_cadence():
+    std = _std()
+    engine = ScoringEngine(std)
+    rows = np.arange(len(std))
+    for today in ["2024-06-01", "2025-06-01", "2030-01-01"]:
+        cols = engine.columns(rows, CADENCE, today=today)
+        assert (cols["Overdue"] == (pd.Timestamp(today) > cols["NextFollowUp"])).all()
+    assert cols["Overdue"].sum() == std["LastContacted_dt"].notna().sum()
+    assert len(engine._follow_ups) == 1
+
+
+def test_days_since_contact_and_score_follow_the_date():
+    std = _std()
+    engine = ScoringEngine(std)
+    rows = np.arange(len(std))
+    scores = []
+    for today in ["2025-10-02", "2025-12-01"]:
+        cols = engine.columns(rows, CADENCE, today=today)
+        days = (pd.Timestamp(today) - std["LastContacted_dt"]).dt.days
+        np.testing.assert_array_equal(cols["DaysSinceContact"], days.to_numpy(dtype=np.float64, na_value=np.nan))
+        # The baseline score: priority, CEO and domain points plus up to -1 for recency.
+        priority = std["Priority"].astype(str).str.lower().map({"high": 3, "med": 2, "medium": 2, "low": 1}).fillna(0)
+        ceo = std["Role"].str.contains("CEO", case=False, na=False) * 2
+        recency = (-days.fillna(60) / 60.0).clip(-1, 0)
+        expected = (priority + ceo + (~std["IsGenericDomain"]).astype(int) + recency).round(2)
+        np.testing.assert_allclose(cols["Score"], expected.to_numpy(dtype=np.float64))
+        scores.append(cols["Score"])
+    assert (scores[1] <= scores[0]).all() and (scores[1] < scores[0]).any()
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from search_index import _BITS, SUBSTRING_SCORE, SearchIndex, trigram_keys
+
+# Accents, a space, a two-char lowercase ("İ"), astral code points and the largest code point.
+ALPHABET = list("abcé É") + ["İ", "😀", "\U0001d11e", "\U0010ffff"]
+
+
+def _random_values(rng, n):
+    values = ["".join(rng.choice(ALPHABET, rng.integers(0, 8))) for _ in range(n)]
+    return values + ["", "a", "😀", "ab"]
+
+
+def test_search_agrees_with_str_contains():
+    rng = np.random.default_rng(4)
+    values = _random_values(rng, 400)
+    index = SearchIndex(pd.DataFrame({"Name": values}), fields=["Name"])
+    rows = np.arange(len(values))
+    # Object dtype lowercases with str.lower like the index; pandas' arrow strings fold "İ" differently.
+    lowered = pd.Series(values, dtype=object).str.lower()
+    queries = {"".join(rng.choice(ALPHABET, rng.integers(1, 6))).strip() for _ in range(300)}
+    queries |= {v[i:j].strip() for v in values[:100] for i, j in [(0, 1), (1, 3), (0, 4), (2, 5)]}
+    for q in sorted(q for q in queries if q):
+        expected = lowered.str.contains(q.lower(), regex=False).to_numpy()
+        np.testing.assert_array_equal(index.search(rows, q, fields=("Name",)) > 0, expected, err_msg=repr(q))
+
+
+def test_word_starts_score_above_other_substrings():
+    values = ["Solar Inc", "Eco Solar", "Consolidated", "s", "Volt"]
+    index = SearchIndex(pd.DataFrame({"Name": values}), fields=["Name"])
+    rows = np.arange(len(values))
+    for q, expected in [("sol", [1, 1, SUBSTRING_SCORE, 0, 0]), ("so", [1, 1, SUBSTRING_SCORE, 0, 0]), ("s", [1, 1, SUBSTRING_SCORE, 1, 0])]:
+        np.testing.assert_allclose(index.search(rows, q, fields=("Name",)), expected, err_msg=q)
+    assert (index.search(rows, "sol", fields=("Name",), prefix=True) > 0).tolist() == [True, True, False, False, False]
+
+
+def test_trigram_keys_pack_21_bit_code_points():
+    text = "a😀\U0010ffff"
+    key = int(trigram_keys(text)[0])
+    mask = (1 << _BITS) - 1
+    assert [key >> 2 * _BITS, (key >> _BITS) & mask, key & mask] == [ord(c) for c in text]
+    assert len(trigram_keys("aaaa")) == 1
+    assert len(trigram_keys("ab")) == 0
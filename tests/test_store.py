@@ -0,0 +1,86 @@
+import numpy as np
+
+from benchmarks.synthetic import prospects
+from ingest import read_upload
+from normalize import build_std, guess_mapping
+from paging import SortKeys
+from scoring import CADENCE, ScoringEngine
+from store import ProspectStore
+
+HEADER = "Name,Email,Company,Country,Owner,Status\n"
+
+
+def _std(rows):
+    df = read_upload("delta.csv", (HEADER + rows).encode("utf-8"))
+    return build_std(df, guess_mapping(df.columns))[0]
+
+
+def test_blank_cells_in_a_delta_keep_stored_values(tmp_path):
+    store = ProspectStore(str(tmp_path / "prospects.sqlite"))
+    assert store.merge(_std("John Smith,john@acme.com,Acme,Germany,Ana,Replied\n")) == {"inserted": 1, "updated": 0, "skipped": 0}
+    assert store.merge(_std("John Smith,JOHN@acme.com,Acme,,,\n")) == {"inserted": 0, "updated": 1, "skipped": 0}
+
+    row = store.load().iloc[0]
+    assert (row["Country"], row["Region"], row["Owner"], row["Status"]) == ("Germany", "EMEA", "Ana", "Replied")
+
+
+def test_unmapped_crm_column_keeps_stored_value(tmp_path):
+    store = ProspectStore(str(tmp_path / "prospects.sqlite"))
+    for rows in ["Name,Email,Company,Country,Present in CRM\nJohn,john@a.com,Acme,Germany,Yes\n",
+                 "Name,Email,Company,Country\nJohn,john@a.com,Acme,Germany\n"]:
+        df = read_upload("delta.csv", rows.encode("utf-8"))
+        mapping = guess_mapping(df.columns)
+        store.merge(build_std(df, mapping)[0], mapping)
+
+    assert store.load()["PresentInCRM"].tolist() == ["Yes"]
+
+
+def test_rows_without_email_name_or_company_are_skipped(tmp_path):
+    store = ProspectStore(str(tmp_path / "prospects.sqlite"))
+    assert store.merge(_std(",,,Italy,,\n,,,France,,\n")) == {"inserted": 0, "updated": 0, "skipped": 2}
+    assert store.count() == 0
+
+
+def test_email_arrives_for_a_name_company_record(tmp_path):
+    store = ProspectStore(str(tmp_path / "prospects.sqlite"))
+    store.merge(_std("Ann Lee,,Volt,Italy,,New\n"))
+    assert store.merge(_std("Ann Lee,ann@volt.it,Volt,,Bruno,\n")) == {"inserted": 0, "updated": 1, "skipped": 0}
+    # A later row without an email still finds the record through name+company.
+    assert store.merge(_std("Ann Lee,,Volt,,,Contacted\n")) == {"inserted": 0, "updated": 1, "skipped": 0}
+
+    std = store.load()
+    assert len(std) == 1
+    assert std.iloc[0][["Email", "Country", "Owner", "Status"]].tolist() == ["ann@volt.it", "Italy", "Bruno", "Contacted"]
+    assert store.version() == 3
+
+
+def _synthetic_store(tmp_path, n=2_000):
+    raw = prospects(n, seed=5)
+    std, _ = build_std(raw, guess_mapping(raw.columns))
+    store = ProspectStore(str(tmp_path / "prospects.sqlite"))
+    store.merge(std)
+    return store
+
+
+def test_kpis_match_the_loaded_view(tmp_path):
+    store = _synthetic_store(tmp_path)
+    filters = {"Region": ["EMEA"]}
+    f = store.load(filters)
+    follow_up = ScoringEngine(f).columns(np.arange(len(f)), CADENCE)
+
+    assert store.kpis(filters) == {
+        "Prospects": len(f), "Countries": f["Country"].nunique(), "Companies": f["Company"].nunique(),
+        "CEOs": f["Role"].str.contains("CEO", case=False, na=False).sum(), "Domains": f["EmailDomain"].nunique(),
+        "Overdue": follow_up["Overdue"].sum(),
+    }
+    assert store.count(filters) == len(f)
+
+
+def test_pages_follow_the_sort_keys_order(tmp_path):
+    store = _synthetic_store(tmp_path)
+    f = store.load()
+    keys = SortKeys(f)
+    for column, descending in [(None, False), (None, True), ("Company", True), ("LastContacted", False), ("Owner", False)]:
+        order = keys.order(np.arange(len(f)), column, descending)
+        page = store.page(column=column, descending=descending, offset=900, limit=50)
+        assert page["Email"].tolist() == f["Email"].to_numpy()[order[900:950]].tolist()
@@ -0,0 +1,63 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+LOG_PATH = os.environ.get("PROSPECT_TIMING_LOG")
+
+logger = logging.getLogger("prospect.timing")
+if LOG_PATH and not logger.handlers:
+    _handler = logging.FileHandler(LOG_PATH)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+
+def log_stage(stage, seconds, rows=None, **fields):
+    """Emit one stage as a JSON line on the ``prospect.timing`` logger (a file when PROSPECT_TIMING_LOG is set)."""
+    record = {"ts": round(time.time(), 3), "stage": stage, "ms": round(seconds * 1000, 2), "rows": rows, **fields}
+    logger.info(json.dumps(record, default=str))
+    return record
+
+
+class StageTimer:
+    """Duration and row count of each stage of one run (a rerun, a benchmark, a pipeline file).
+
+    `lap(stage, rows)` closes a stage that started at the previous lap (or at construction), so a
+    straight-line script only needs one call after each step. `fields` are added to every log record.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self.records = []
+        self._last = time.perf_counter()
+
+    def lap(self, stage, rows=None):
+        now = time.perf_counter()
+        record = log_stage(stage, now - self._last, rows, **self.fields)
+        self.records.append(record)
+        self._last = now
+        return record
+
+    @contextmanager
+    def stage(self, stage, rows=None):
+        """Time only the enclosed block; the yielded dict's "rows" can be set inside it."""
+        info = {"rows": rows}
+        self._last = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.lap(stage, info["rows"])
+
+    def seconds(self):
+        return {r["stage"]: r["ms"] / 1000 for r in self.records}
+
+    def frame(self):
+        """One row per stage with its share of the total time."""
+        df = pd.DataFrame(self.records, columns=["stage", "ms", "rows"])
+        total = df["ms"].sum()
+        df["share"] = (df["ms"] / total).round(3) if total else 0.0
+        return df